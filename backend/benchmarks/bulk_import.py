@@ -0,0 +1,81 @@
+"""Bulk receipt import throughput: import_receipts() vs. one ORM insert per receipt.
+
+Usage (from backend/, against the database in DATABASE_URL):
+    python benchmarks/bulk_import.py --receipts 1000000 --user-id 1 [--baseline 2000]
+
+Generated receipts are inserted for real; run it against a scratch database.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend import create_app, db, import_receipts, Receipt, ReceiptItem  # noqa: E402
+
+app = create_app()
+from bulk_import import iter_records  # noqa: E402
+
+STORES = ["Publix", "Walmart", "Target", "Delta", "Uber", "Home Depot", "Hilton", "Pizza Hut"]
+CATEGORIES = ["Groceries", "Flight", "Transportation", "Materials/Tools", "Lodging", "Meals"]
+
+
+def generate(path, count, seed=7):
+    rng = random.Random(seed)
+    with open(path, 'w', encoding='utf-8') as f:
+        for _ in range(count):
+            f.write(json.dumps({
+                "store": rng.choice(STORES),
+                "category": rng.choice(CATEGORIES),
+                "items": [{"name": f"item {n}", "amount": f"{rng.uniform(1, 60):.2f}"} for n in range(rng.randint(1, 5))],
+            }) + "\n")
+
+
+def orm_one_by_one(path, user_id, limit):
+    # The /manual-receipt pattern: add, flush for the id, add each item, commit
+    with open(path, encoding='utf-8') as f:
+        for _, record in zip(range(limit), iter_records(f, 'ndjson')):
+            record = record[1]
+            receipt = Receipt(user_id=user_id, store_name=record["store"], category=record["category"],
+                              amount=sum(float(i["amount"]) for i in record["items"]))
+            db.session.add(receipt)
+            db.session.flush()
+            for item in record["items"]:
+                db.session.add(ReceiptItem(receipt_id=receipt.id, item_name=item["name"], amount=float(item["amount"])))
+            db.session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--receipts', type=int, default=100000)
+    parser.add_argument('--user-id', type=int, required=True)
+    parser.add_argument('--batch-size', type=int, default=5000)
+    parser.add_argument('--baseline', type=int, default=2000, help="receipts to insert one by one for comparison")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp, app.app_context():
+        path = os.path.join(tmp, 'receipts.ndjson')
+        generate(path, args.receipts)
+
+        start = time.perf_counter()
+        with open(path, encoding='utf-8') as f:
+            report = import_receipts(iter_records(f, 'ndjson'), args.user_id, args.batch_size)
+        bulk = time.perf_counter() - start
+        print(f"bulk: {report['imported']} receipts in {bulk:.1f}s ({report['imported'] / bulk:.0f}/s), "
+              f"{report['failed']} failed")
+
+        if args.baseline:
+            start = time.perf_counter()
+            orm_one_by_one(path, args.user_id, args.baseline)
+            single = time.perf_counter() - start
+            rate = args.baseline / single
+            print(f"one by one: {args.baseline} receipts in {single:.1f}s ({rate:.0f}/s); "
+                  f"{args.receipts} would take ~{args.receipts / rate / 60:.1f} min")
+
+
+if __name__ == '__main__':
+    main()
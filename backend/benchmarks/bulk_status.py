@@ -0,0 +1,64 @@
+"""Approval throughput: /bulk-update-receipt-status vs. one /update-receipt-status call per receipt.
+
+Usage (from backend/, against the database in DATABASE_URL):
+    python benchmarks/bulk_status.py --receipts 10000 --user-id 1 --supervisor-id 2
+
+Seeds two sets of pending receipts for --user-id and approves one set one by one and
+the other in a single bulk request, both through the Flask test client with a token for
+--supervisor-id (who must be a supervisor or admin). Run it against a scratch database.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask_jwt_extended import create_access_token  # noqa: E402
+
+from backend import create_app, import_receipts, Receipt  # noqa: E402
+
+app = create_app()
+
+
+def seed(count, user_id, store):
+    records = ((n, {"store": store, "category": "Meals", "items": [{"name": "lunch", "amount": "12.50"}]})
+               for n in range(count))
+    import_receipts(records, user_id)
+    return [receipt_id for (receipt_id,) in
+            Receipt.query.filter_by(store_name=store, status='Pending').with_entities(Receipt.id)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--receipts', type=int, default=10000)
+    parser.add_argument('--user-id', type=int, required=True)
+    parser.add_argument('--supervisor-id', type=int, required=True)
+    args = parser.parse_args()
+
+    client = app.test_client()
+    with app.app_context():
+        headers = {"Authorization": f"Bearer {create_access_token(identity=str(args.supervisor_id))}"}
+        run = int(time.time())
+        single_ids = seed(args.receipts, args.user_id, f"bench-single-{run}")
+        bulk_ids = seed(args.receipts, args.user_id, f"bench-bulk-{run}")
+
+    start = time.perf_counter()
+    for receipt_id in single_ids:
+        response = client.post(f'/update-receipt-status/{receipt_id}', headers=headers,
+                               json={"status": "Approved", "comments": "benchmark"})
+        assert response.status_code == 200, response.get_json()
+    single = time.perf_counter() - start
+    print(f"one by one: {len(single_ids)} approvals in {single:.1f}s ({len(single_ids) / single:.0f}/s)")
+
+    start = time.perf_counter()
+    response = client.post('/bulk-update-receipt-status', headers=headers,
+                           json={"status": "Approved", "ids": bulk_ids, "comments": "benchmark"})
+    bulk = time.perf_counter() - start
+    assert response.status_code == 200, response.get_json()
+    print(f"bulk: {response.get_json()['updated']} approvals in {bulk:.2f}s "
+          f"({len(bulk_ids) / bulk:.0f}/s), {single / bulk:.0f}x faster")
+
+
+if __name__ == '__main__':
+    main()
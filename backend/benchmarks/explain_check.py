@@ -0,0 +1,57 @@
+"""Check that the hot receipt queries are served by index scans (PostgreSQL only).
+
+Usage (from backend/, against the database in DATABASE_URL):
+    python benchmarks/explain_check.py
+
+Sequential scans are disabled for the session so the planner reports whether an index
+*can* serve each query even on a small development table. Exits non-zero if any query
+still needs a sequential scan.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text  # noqa: E402
+
+from backend import create_app, db, Receipt, ReceiptItem, ReceiptAudit  # noqa: E402
+
+app = create_app()
+
+
+def hot_queries():
+    return {
+        "employee history": Receipt.query.filter_by(user_id=1).order_by(Receipt.uploaded_at.desc()),
+        "supervisor keyset page": Receipt.query.order_by(Receipt.uploaded_at.desc(), Receipt.id.desc()).limit(50),
+        "pending approval queue": Receipt.query.filter_by(status='Pending'),
+        "items by receipt": ReceiptItem.query.filter_by(receipt_id=1),
+        "audit by receipt": ReceiptAudit.query.filter_by(receipt_id=1),
+    }
+
+
+def plan_nodes(plan):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def main():
+    failures = 0
+    with app.app_context():
+        if db.engine.dialect.name != 'postgresql':
+            sys.exit("EXPLAIN checks need PostgreSQL")
+        with db.engine.connect() as connection:
+            connection.execute(text("SET enable_seqscan = off"))
+            for name, query in hot_queries().items():
+                sql = str(query.statement.compile(db.engine, compile_kwargs={"literal_binds": True}))
+                plan = connection.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()[0]["Plan"]
+                scans = [node["Node Type"] + (f" ({node['Index Name']})" if "Index Name" in node else "")
+                         for node in plan_nodes(plan) if "Scan" in node["Node Type"]]
+                ok = scans and not any(scan.startswith("Seq Scan") for scan in scans)
+                failures += not ok
+                print(f"{'ok' if ok else 'FAIL':>4}  {name}: {', '.join(scans) or 'no scan'}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
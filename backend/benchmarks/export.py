@@ -0,0 +1,128 @@
+"""Analytics export benchmark: paging /all-expense-history as JSON vs /export Arrow streams vs Parquet files.
+
+Usage (from backend/, against a scratch database in DATABASE_URL, PostgreSQL or SQLite; needs pyarrow):
+    python benchmarks/export.py --scale 100k --output export-100k.json
+    python benchmarks/export.py --scale 100k --no-seed --page-size 500
+
+Seeds receipts the way benchmarks/suite.py does (skip with --no-seed), then pulls every receipt and
+item three ways and reports, for each, the time to produce the data, the bytes produced, and the
+time to load it back into columns (json.loads, the Arrow stream reader, the Parquet dataset reader):
+
+- json: keyset pages of /all-expense-history (?limit=&cursor=), as the analytics team reads it today
+- arrow: /export/receipts and /export/receipt_items as Arrow IPC streams
+- parquet: flask export-data into a temporary directory (zstd, monthly partitions)
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from flask_jwt_extended import create_access_token  # noqa: E402
+
+from suite import app, db, parse_scale, seed, seed_users  # noqa: E402
+from exports import import_pyarrow  # noqa: E402
+
+FAR_FUTURE = "9999-01-01T00:00:00"  # exports leave out the last EXPORT_WATERMARK_LAG otherwise
+
+
+def directory_size(path):
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+
+
+def time_json(client, headers, page_size):
+    produced, parsed, size, receipts, items = 0.0, 0.0, 0, 0, 0
+    cursor = None
+    while True:
+        query = {"limit": page_size, **({"cursor": cursor} if cursor else {})}
+        start = time.perf_counter()
+        response = client.get('/all-expense-history', headers=headers, query_string=query)
+        body = response.get_data()
+        produced += time.perf_counter() - start
+        start = time.perf_counter()
+        page = json.loads(body)
+        parsed += time.perf_counter() - start
+        size += len(body)
+        receipts += len(page["history"])
+        items += sum(len(entry["items"]) for entry in page["history"])
+        cursor = page.get("next_cursor")
+        if not cursor:
+            break
+    return {"receipts": receipts, "items": items, "seconds": round(produced, 3), "bytes": size,
+            "load_seconds": round(parsed, 3)}
+
+
+def time_arrow(client, headers):
+    pa, _ = import_pyarrow()
+    result = {"seconds": 0.0, "bytes": 0, "load_seconds": 0.0}
+    for table, key in (("receipts", "receipts"), ("receipt_items", "items")):
+        start = time.perf_counter()
+        body = client.get(f'/export/{table}', headers=headers, query_string={"until": FAR_FUTURE}).get_data()
+        result["seconds"] += time.perf_counter() - start
+        start = time.perf_counter()
+        result[key] = pa.ipc.open_stream(body).read_all().num_rows
+        result["load_seconds"] += time.perf_counter() - start
+        result["bytes"] += len(body)
+    return dict(result, seconds=round(result["seconds"], 3), load_seconds=round(result["load_seconds"], 3))
+
+
+def time_parquet():
+    import pyarrow.dataset as ds
+    result = {}
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        app.test_cli_runner().invoke(args=['export-data', directory, '--table', 'receipts', '--table', 'receipt_items',
+                                           '--until', FAR_FUTURE], catch_exceptions=False)
+        result["seconds"] = round(time.perf_counter() - start, 3)
+        result["bytes"] = directory_size(directory)
+        start = time.perf_counter()
+        for table, key in (("receipts", "receipts"), ("receipt_items", "items")):
+            result[key] = ds.dataset(os.path.join(directory, table), format='parquet',
+                                     partitioning='hive').to_table().num_rows
+        result["load_seconds"] = round(time.perf_counter() - start, 3)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scale', default="10000", help="1k, 100k, 1m or a number of receipts")
+    parser.add_argument('--employees', type=int, default=50)
+    parser.add_argument('--supervisors', type=int, default=5)
+    parser.add_argument('--no-seed', action='store_true', help="reuse a database seeded by an earlier run")
+    parser.add_argument('--page-size', type=int, default=1000, help="/all-expense-history page size")
+    parser.add_argument('--output', help="write the results as JSON")
+    args = parser.parse_args()
+
+    import_pyarrow()
+    client = app.test_client()
+    with app.app_context():
+        users = seed_users(args.employees, args.supervisors)
+        if not args.no_seed:
+            seeded = seed(parse_scale(args.scale), users)
+            print(f"seeded {seeded['receipts']} receipts in {seeded['seconds']}s")
+        headers = {"Authorization": f"Bearer {create_access_token(identity=str(users['admin'][0]))}"}
+        results = {"database": db.engine.dialect.name}
+
+    results["json"] = time_json(client, headers, args.page_size)
+    results["arrow"] = time_arrow(client, headers)
+    results["parquet"] = time_parquet()
+
+    baseline = results["json"]
+    print(f"{'':8} {'receipts':>9} {'items':>9} {'seconds':>8} {'MB':>8} {'load s':>7} {'vs json':>8}")
+    for name in ("json", "arrow", "parquet"):
+        row = results[name]
+        speedup = baseline["seconds"] / row["seconds"] if row["seconds"] else float('inf')
+        print(f"{name:8} {row['receipts']:>9} {row['items']:>9} {row['seconds']:>8.2f} {row['bytes'] / 1e6:>8.2f} "
+              f"{row['load_seconds']:>7.2f} {speedup:>7.1f}x")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"wrote {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,163 @@
+"""HTTP load test of the read-heavy routes: requests per second and p50/p99 latency per route.
+
+Usage (from backend/):
+    # against a server that is already running
+    python benchmarks/load_test.py --url http://localhost:5000 --email a@example.com --password pw
+    # start gunicorn once per setting combination (DATABASE_URL etc. come from the environment)
+    python benchmarks/load_test.py --email a@example.com --password pw \\
+        --spawn --workers 2,4 --worker-class sync,gthread --threads 4 --pool-size 5,10
+
+Logs in once, then --concurrency client threads issue a weighted mix of GET requests for
+--duration seconds. The account should be a supervisor or admin so /audit-logs is allowed.
+"""
+import argparse
+import itertools
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (weight, route): roughly what the dashboards issue per page load
+ROUTES = [
+    (5, "/fetch-receipts?limit=50"),
+    (3, "/statistics"),
+    (2, "/user-expense-history?limit=50"),
+    (2, "/search?q=coffee&limit=50"),
+    (1, "/audit-logs?limit=50"),
+    (1, "/ocr-cache/stats"),
+]
+
+
+def call(url, token=None, body=None):
+    headers = {"Content-Type": "application/json"}
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    data = json.dumps(body).encode('utf-8') if body is not None else None
+    request = urllib.request.Request(url, data=data, headers=headers)
+    try:
+        with urllib.request.urlopen(request, timeout=60) as response:
+            return response.status, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.read()
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def run_load(url, token, concurrency, duration, seed=7):
+    paths = [path for weight, path in ROUTES for _ in range(weight)]
+    timings = defaultdict(list)
+    errors = defaultdict(int)
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client(n):
+        rng = random.Random(seed + n)
+        while time.perf_counter() < deadline:
+            path = rng.choice(paths)
+            start = time.perf_counter()
+            try:
+                status, _ = call(url + path, token)
+            except OSError:
+                status = None
+            elapsed = (time.perf_counter() - start) * 1000
+            with lock:
+                timings[path].append(elapsed)
+                if status != 200:
+                    errors[path] += 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(client, range(concurrency)))
+    return timings, errors, time.perf_counter() - start
+
+
+def report(timings, errors, elapsed):
+    total = sum(len(values) for values in timings.values())
+    all_values = sorted(value for values in timings.values() for value in values)
+    print(f"  {total} requests in {elapsed:.1f}s: {total / elapsed:.1f} req/s, "
+          f"p50 {percentile(all_values, 0.5):.1f} ms, p99 {percentile(all_values, 0.99):.1f} ms, "
+          f"{sum(errors.values())} errors")
+    for _, path in ROUTES:
+        values = sorted(timings.get(path, []))
+        print(f"    {path:<35} {len(values):>6}  p50 {percentile(values, 0.5):>7.1f} ms  "
+              f"p99 {percentile(values, 0.99):>7.1f} ms  {errors.get(path, 0)} errors")
+
+
+def login(url, email, password):
+    status, body = call(url + "/login", body={"email": email, "password": password})
+    if status != 200:
+        sys.exit(f"login failed ({status}): {body.decode('utf-8', 'replace')}")
+    return json.loads(body)["token"]
+
+
+def wait_until_up(url, process, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            sys.exit("gunicorn exited during startup")
+        try:
+            call(url + "/")
+            return
+        except OSError:
+            time.sleep(0.2)
+    sys.exit("gunicorn did not come up")
+
+
+def spawn(args, workers, worker_class, pool_size):
+    env = dict(os.environ, GUNICORN_BIND=f"127.0.0.1:{args.port}", GUNICORN_WORKERS=str(workers),
+               GUNICORN_WORKER_CLASS=worker_class, GUNICORN_THREADS=str(args.threads),
+               DB_POOL_SIZE=str(pool_size))
+    return subprocess.Popen([sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "wsgi:app"],
+                            cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', default=None, help="server to test (default: the spawned gunicorn)")
+    parser.add_argument('--email', required=True)
+    parser.add_argument('--password', required=True)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=30)
+    parser.add_argument('--spawn', action='store_true', help="start gunicorn for each setting combination")
+    parser.add_argument('--port', type=int, default=5055)
+    parser.add_argument('--workers', default="4", help="comma-separated, with --spawn")
+    parser.add_argument('--worker-class', default="sync", help="comma-separated, with --spawn")
+    parser.add_argument('--threads', type=int, default=4, help="threads per gthread worker")
+    parser.add_argument('--pool-size', default="5", help="comma-separated DB_POOL_SIZE values, with --spawn")
+    args = parser.parse_args()
+
+    if not args.spawn:
+        url = args.url or "http://localhost:5000"
+        print(f"{url}, {args.concurrency} clients:")
+        report(*run_load(url, login(url, args.email, args.password), args.concurrency, args.duration))
+        return
+
+    url = f"http://127.0.0.1:{args.port}"
+    settings = itertools.product([int(n) for n in args.workers.split(',')], args.worker_class.split(','),
+                                 [int(n) for n in args.pool_size.split(',')])
+    for workers, worker_class, pool_size in settings:
+        print(f"{workers} x {worker_class} workers, pool size {pool_size}, {args.concurrency} clients:")
+        process = spawn(args, workers, worker_class, pool_size)
+        try:
+            wait_until_up(url, process)
+            report(*run_load(url, login(url, args.email, args.password), args.concurrency, args.duration))
+        finally:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""Login throughput under concurrency, and what a login burst does to other routes' latency.
+
+Usage (from backend/, against the database in DATABASE_URL):
+    python benchmarks/login.py --logins 200 --concurrency 32 --workers 1,2,4 --rounds 12
+
+Creates (or reuses) one benchmark user, then for each PASSWORD_WORKERS value fires --logins
+POST /login requests from --concurrency threads through the Flask test client while another
+thread keeps calling GET / and records its latency. Run it against a scratch database.
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import backend  # noqa: E402
+from backend import create_app, db, User, UserRole  # noqa: E402
+from passwords import PasswordHasher  # noqa: E402
+
+app = create_app()
+
+EMAIL = "login-benchmark@example.com"
+PASSWORD = "benchmark-password"
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))] if values else 0.0
+
+
+def ensure_user(rounds):
+    with app.app_context():
+        hasher = PasswordHasher(rounds=rounds)
+        user = User.query.filter_by(email=EMAIL).first()
+        if user is None:
+            role = UserRole.query.filter_by(role='Employee').first()
+            user = User(name="Login Benchmark", email=EMAIL, role_id=role.id if role else None)
+            db.session.add(user)
+        user.password_hash = hasher.hash(PASSWORD)
+        db.session.commit()
+
+
+def run(workers, args):
+    backend.passwords = PasswordHasher(rounds=args.rounds, workers=workers,
+                                       max_pending=args.max_pending, queue_timeout=args.queue_timeout)
+    login_timings, statuses, other_timings = [], [], []
+    done = threading.Event()
+
+    def login(_):
+        client = app.test_client()
+        start = time.perf_counter()
+        response = client.post('/login', json={"email": EMAIL, "password": PASSWORD})
+        login_timings.append((time.perf_counter() - start) * 1000)
+        statuses.append(response.status_code)
+
+    def other_route():
+        client = app.test_client()
+        while not done.is_set():
+            start = time.perf_counter()
+            client.get('/')
+            other_timings.append((time.perf_counter() - start) * 1000)
+            time.sleep(0.005)
+
+    watcher = threading.Thread(target=other_route)
+    watcher.start()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        list(pool.map(login, range(args.logins)))
+    elapsed = time.perf_counter() - start
+    done.set()
+    watcher.join()
+
+    ok = statuses.count(200)
+    print(f"  workers {workers}: {ok / elapsed:6.1f} logins/s, login p50 {statistics.median(login_timings):7.1f} ms "
+          f"p99 {percentile(login_timings, 0.99):7.1f} ms, {statuses.count(503)} busy (503), "
+          f"GET / p99 {percentile(other_timings, 0.99):6.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--logins', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--workers', default="1,2,4", help="comma-separated PASSWORD_WORKERS values")
+    parser.add_argument('--rounds', type=int, default=backend.BCRYPT_ROUNDS)
+    parser.add_argument('--max-pending', type=int, default=8)
+    parser.add_argument('--queue-timeout', type=float, default=2.0)
+    args = parser.parse_args()
+
+    # The stored hash uses --rounds too, so no login in the run pays for a rehash
+    ensure_user(args.rounds)
+    print(f"{args.logins} logins from {args.concurrency} threads, bcrypt cost {args.rounds}:")
+    for workers in [int(n) for n in args.workers.split(',')]:
+        run(workers, args)
+
+
+if __name__ == '__main__':
+    main()
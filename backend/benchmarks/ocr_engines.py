@@ -0,0 +1,82 @@
+"""Per-image latency and throughput of each OCR engine behind extract_text.
+
+Usage (from backend/):
+    python benchmarks/ocr_engines.py --engines pytesseract,tesserocr --repeat 8 --threads 4 [image ...]
+
+Latency is measured one image at a time after a warm-up image; throughput runs the same
+images on --threads threads sharing one engine (tesserocr gets one API handle per thread).
+Defaults to the sample receipts in uploads/.
+"""
+import argparse
+import glob
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ocr import extract_text  # noqa: E402
+from ocr_engines import ENGINES  # noqa: E402
+
+
+def make_engine(name, threads):
+    return ENGINES[name](pool_size=threads) if name == 'tesserocr' else ENGINES[name]()
+
+
+def latency(engine, images):
+    extract_text(images[0], engine=engine)  # warm-up: loads the language model once
+    totals, ocr = [], []
+    for path in images:
+        start = time.perf_counter()
+        result = extract_text(path, engine=engine)
+        totals.append((time.perf_counter() - start) * 1000)
+        ocr.append(result.get("timings", {}).get("ocr", 0))
+    return totals, ocr
+
+
+def throughput(engine, images, threads):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = list(pool.map(lambda path: extract_text(path, engine=engine), images))
+    elapsed = time.perf_counter() - start
+    return len(images) / elapsed, sum(1 for r in results if "error" in r)
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('images', nargs='*')
+    parser.add_argument('--engines', default=','.join(ENGINES))
+    parser.add_argument('--repeat', type=int, default=4, help="times each image is processed")
+    parser.add_argument('--threads', type=int, default=4)
+    args = parser.parse_args()
+
+    images = args.images or sorted(glob.glob(os.path.join('uploads', '*')))
+    images = [path for path in images if os.path.isfile(path)] * args.repeat
+    if not images:
+        sys.exit("No images to benchmark")
+
+    print(f"{'engine':>12} {'mean ms':>8} {'p50 ms':>8} {'p95 ms':>8} {'ocr ms':>8} {'img/s':>8} {'failed':>7}")
+    for name in args.engines.split(','):
+        try:
+            engine = make_engine(name, args.threads)
+            try:
+                totals, ocr = latency(engine, images)
+                rate, failures = throughput(engine, images, args.threads)
+            finally:
+                engine.close()
+        except Exception as e:  # missing package or binary: report it and carry on with the next engine
+            print(f"{name:>12} skipped: {e}")
+            continue
+        print(f"{name:>12} {statistics.mean(totals):>8.1f} {percentile(totals, 0.5):>8.1f} "
+              f"{percentile(totals, 0.95):>8.1f} {statistics.mean(ocr):>8.1f} {rate:>8.2f} {failures:>7}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""Throughput of OCR (extract_text) across OCR process-pool sizes.
+
+Usage (from backend/):
+    python benchmarks/ocr_pool.py --sizes 1,2,4 --repeat 8 [image ...]
+
+Defaults to the sample receipts in uploads/.
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ocr import run_ocr  # noqa: E402
+
+
+def run(images, pool_size):
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=pool_size) as pool:
+        results = list(pool.map(run_ocr, images))
+    elapsed = time.perf_counter() - start
+    failures = sum(1 for r in results if "error" in r)
+    return elapsed, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('images', nargs='*')
+    parser.add_argument('--sizes', default='1,2,4')
+    parser.add_argument('--repeat', type=int, default=4, help="times each image is submitted")
+    args = parser.parse_args()
+
+    images = args.images or sorted(glob.glob(os.path.join('uploads', '*')))
+    images = [path for path in images if os.path.isfile(path)] * args.repeat
+    if not images:
+        sys.exit("No images to benchmark")
+
+    print(f"{'workers':>8} {'images':>7} {'seconds':>9} {'img/s':>8} {'failed':>7}")
+    for size in (int(s) for s in args.sizes.split(',')):
+        elapsed, failures = run(images, size)
+        print(f"{size:>8} {len(images):>7} {elapsed:>9.2f} {len(images) / elapsed:>8.2f} {failures:>7}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+"""Receipt text parser microbenchmark: receipt_parser vs. the original multi-pass parser.
+
+Usage (from backend/):
+    python benchmarks/parser.py [--receipts 100000] [--seed 17]
+
+Every synthetic receipt is parsed by both implementations and the outputs must match.
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from receipt_parser import parse_receipt_text, CATEGORY_KEYWORDS, STOP_WORDS  # noqa: E402
+
+WORDS = ["milk", "bread", "eggs", "h/dz bar", "caramel", "plain 5%", "chips", "soda", "dinner", "tools",
+         "business", "trainer", "coffee", "napkins", "tax id", "ticket", "room", "fuel"]
+
+
+# The parser as it was inlined in extract_text before receipt_parser.py; kept as the parity reference
+def legacy_parse(text):
+    # Extract total amount
+    amount_match = re.search(r"\$\s?(\d+\.\d{2})", text)
+    total_amount = float(amount_match.group(1)) if amount_match else None
+
+    # Extract store name (first line)
+    store_name = text.split('\n')[0].strip() if text else 'Unknown'
+
+    # Extract receipt date
+    date_match = re.search(r"(\d{2}/\d{2}/\d{4})", text)
+    receipt_date = date_match.group(1) if date_match else None
+
+    # Smart category detection
+    def detect_category(text):
+        text_lower = text.lower()
+        if any(keyword in text_lower for keyword in ["walmart", "target", "publix", "grocery", "supermarket", "aldi", "costco"]):
+            return "Groceries"
+        elif any(keyword in text_lower for keyword in ["airlines", "flight", "delta", "american airlines", "united airlines", "airport"]):
+            return "Flight"
+        elif any(keyword in text_lower for keyword in ["uber", "lyft", "taxi", "transport", "bus", "train", "subway"]):
+            return "Transportation"
+        elif any(keyword in text_lower for keyword in ["home depot", "lowe's", "hardware", "tools", "material", "construction"]):
+            return "Materials/Tools"
+        elif any(keyword in text_lower for keyword in ["hotel", "motel", "inn", "resort", "bnb"]):
+            return "Lodging"
+        elif any(keyword in text_lower for keyword in ["restaurant", "dining", "food", "pizza", "burger", "cafe", "steakhouse"]):
+            return "Meals"
+        else:
+            return "Other"
+
+    category = detect_category(text)
+
+    # Extract items and promotions
+    items = []
+    lines = text.split('\n')
+    last_item_name = None
+    i = 0
+
+    while i < len(lines):
+        line = lines[i].strip()
+        line_lower = line.lower()
+
+        if any(keyword in line_lower for keyword in ["order total", "sales tax", "grand total", "change", "amount", "balance", "payment", "cash", "subtotal", "savings summary", "special price savings"]):
+            break
+
+        if "promotion" in line_lower:
+            match = re.search(r"promotion\s+\-?\$?\s*(\d+\.\d{2})", line_lower)
+            if match and last_item_name:
+                promo_price = float(match.group(1))
+                items.append((f"Promotion for {last_item_name}", -abs(promo_price)))
+            i += 1
+            continue
+
+        match = re.search(r"(.+?)\s+\$?\s*(\d+\.\d{2})", line)
+        if match:
+            item_name = match.group(1).strip()
+            item_price = float(match.group(2))
+            items.append((item_name, item_price))
+            last_item_name = item_name
+
+        i += 1
+
+    return {
+        "raw_text": text,
+        "amount": total_amount,
+        "store_name": store_name,
+        "receipt_date": receipt_date,
+        "category": category,
+        "items": items
+    }
+
+
+def synthetic_receipt(rng):
+    keywords = [k for _, ks in CATEGORY_KEYWORDS for k in ks]
+    lines = [f"{rng.choice(keywords).title()} #{rng.randint(1, 999)}", f"{rng.randint(1, 9999)} Main St"]
+    for _ in range(rng.randint(0, 25)):
+        price = f"{rng.uniform(0.5, 80):.2f}"
+        if rng.random() < 0.1:
+            lines.append(f"   Promotion   -{price}")
+        else:
+            lines.append(f"  {rng.choice(WORDS).upper()} {rng.choice(WORDS)}   {rng.choice(['', '$'])}{price} T F")
+    lines.append(f"  {rng.choice(STOP_WORDS).title()}   {rng.uniform(5, 300):.2f}")
+    lines.append(f"Amount: ${rng.uniform(5, 300):.2f}")
+    lines.append(f"{rng.randint(1, 12):02d}/{rng.randint(1, 28):02d}/2025 17:03")
+    if rng.random() < 0.3:
+        lines.append(rng.choice(keywords))
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--receipts', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=17)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    corpus = [synthetic_receipt(rng) for _ in range(args.receipts)]
+
+    timings = {}
+    outputs = {}
+    for name, parse in (("legacy", legacy_parse), ("receipt_parser", parse_receipt_text)):
+        start = time.perf_counter()
+        outputs[name] = [parse(text) for text in corpus]
+        timings[name] = time.perf_counter() - start
+
+    mismatches = sum(1 for a, b in zip(outputs["legacy"], outputs["receipt_parser"]) if a != b)
+    for name, seconds in timings.items():
+        print(f"{name:>15}: {seconds:7.2f}s  {args.receipts / seconds:10.0f} receipts/s")
+    print(f"speedup: {timings['legacy'] / timings['receipt_parser']:.2f}x, mismatches: {mismatches}")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""Per-stage preprocessing latency, OCR time and total-amount accuracy with and without preprocessing.
+
+Usage (from backend/):
+    python benchmarks/preprocess.py [--stages grayscale,crop,downscale,deskew] [--expected totals.json] [image ...]
+
+--expected is a JSON object of {file name: receipt total}; the bundled samples are known.
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ocr import extract_text  # noqa: E402
+from preprocess import DEFAULT_STAGES  # noqa: E402
+
+KNOWN_TOTALS = {"receiptpublix.jpeg": 13.51}
+
+
+def run(images, stages, expected):
+    timings = defaultdict(float)
+    correct = checked = 0
+    for path in images:
+        result = extract_text(path, stages)
+        if "error" in result:
+            print(f"  {os.path.basename(path)}: {result['error']}")
+            continue
+        for stage, ms in result["timings"].items():
+            timings[stage] += ms
+        total = expected.get(os.path.basename(path))
+        if total is not None:
+            checked += 1
+            correct += result["amount"] is not None and abs(result["amount"] - total) < 0.005
+    return timings, correct, checked
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('images', nargs='*')
+    parser.add_argument('--stages', default=DEFAULT_STAGES)
+    parser.add_argument('--expected', help="JSON file of expected totals by file name")
+    args = parser.parse_args()
+
+    images = args.images or sorted(p for p in glob.glob(os.path.join('uploads', '*')) if os.path.isfile(p))
+    expected = dict(KNOWN_TOTALS)
+    if args.expected:
+        with open(args.expected, encoding='utf-8') as f:
+            expected.update(json.load(f))
+
+    for label, stages in (("raw", []), ("preprocessed", args.stages.split(','))):
+        timings, correct, checked = run(images, stages, expected)
+        print(f"{label} ({', '.join(stages) or 'no stages'}) over {len(images)} images:")
+        for stage, ms in timings.items():
+            print(f"  {stage:>10}: {ms / max(len(images), 1):8.1f} ms/image")
+        print(f"  {'total':>10}: {sum(timings.values()) / max(len(images), 1):8.1f} ms/image")
+        print(f"  total-amount accuracy: {correct}/{checked}")
+
+
+if __name__ == '__main__':
+    main()
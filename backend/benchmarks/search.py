@@ -0,0 +1,92 @@
+"""/search latency at scale (PostgreSQL with migration 0006 applied).
+
+Usage (from backend/, against the database in DATABASE_URL):
+    python benchmarks/search.py --receipts 1000000 --user-id 1 --supervisor-id 2 [--no-seed]
+
+Seeds receipts with store names, item names and OCR-like text through import_receipts
+(skip with --no-seed on a database seeded before), then times each query as a supervisor
+(every receipt visible) and as the employee (own receipts only). Run it against a scratch database.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask_jwt_extended import create_access_token  # noqa: E402
+
+from backend import create_app, import_receipts  # noqa: E402
+
+app = create_app()
+
+STORES = ["Publix", "Walmart", "Target", "Delta", "Uber", "Home Depot", "Hilton", "Pizza Hut", "Shell", "Costco"]
+ITEMS = ["bananas", "milk", "bread", "unleaded", "hammer", "nails", "room night", "pepperoni", "coffee", "ticket"]
+CATEGORIES = ["Groceries", "Flight", "Transportation", "Materials/Tools", "Lodging", "Meals"]
+QUERIES = [
+    "q=bananas",
+    "q=home depot hammer",
+    "q=publx",  # misspelled: trigram store match
+    "q=coffee&min_amount=10&max_amount=20",
+    "q=unleaded&start_date=2025-01-01&end_date=2025-03-31",
+]
+
+
+def records(count, user_ids, seed=11):
+    rng = random.Random(seed)
+    for n in range(count):
+        store = rng.choice(STORES)
+        items = [{"name": rng.choice(ITEMS), "amount": f"{rng.uniform(1, 40):.2f}"} for _ in range(rng.randint(1, 4))]
+        yield n, {
+            "user_id": rng.choice(user_ids),
+            "store": store,
+            "category": rng.choice(CATEGORIES),
+            "uploaded_at": f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T12:00:00",
+            "items": items,
+            "extracted_text": f"{store.upper()} STORE #{rng.randint(1, 999)}\n" + "\n".join(
+                f"{item['name'].upper()} {item['amount']}" for item in items) + "\nTHANK YOU FOR SHOPPING",
+        }
+
+
+def time_queries(client, headers, repeat):
+    for query in QUERIES:
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            response = client.get(f"/search?{query}&limit=50", headers=headers)
+            timings.append((time.perf_counter() - start) * 1000)
+            assert response.status_code == 200, response.get_json()
+        hits = len(response.get_json()["results"])
+        print(f"  {query:<55} p50 {statistics.median(timings):>7.1f} ms  "
+              f"max {max(timings):>7.1f} ms  {hits} hits")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--receipts', type=int, default=1000000)
+    parser.add_argument('--user-id', type=int, required=True)
+    parser.add_argument('--supervisor-id', type=int, required=True)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--no-seed', action='store_true')
+    args = parser.parse_args()
+
+    client = app.test_client()
+    with app.app_context():
+        if not args.no_seed:
+            start = time.perf_counter()
+            report = import_receipts(records(args.receipts, [args.user_id, args.supervisor_id]), args.user_id)
+            print(f"seeded {report['imported']} receipts in {time.perf_counter() - start:.0f}s")
+        tokens = {
+            "supervisor": create_access_token(identity=str(args.supervisor_id)),
+            "employee": create_access_token(identity=str(args.user_id)),
+        }
+
+    for role, token in tokens.items():
+        print(f"{role}:")
+        time_queries(client, {"Authorization": f"Bearer {token}"}, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,464 @@
+"""Endpoint and OCR benchmark suite over a seeded synthetic dataset, with JSON results and a regression check.
+
+Usage (from backend/, against a scratch database in DATABASE_URL, PostgreSQL or SQLite):
+    python benchmarks/suite.py --scale 100k --output results-100k.json
+    python benchmarks/suite.py --scale 100k --no-seed --baseline results-100k.json --threshold 1.25
+    python benchmarks/suite.py --only ocr --ocr-generated 10
+
+--scale is 1k, 100k or 1m receipts (or a plain number). Seeding adds employees, supervisors and an
+admin, receipts with one to four items spread over two years (and their statistics rollups, through
+import_receipts), and one audit row per approved or rejected receipt. Every route is then called
+--repeat times through the Flask test client, reading the whole body, so streamed responses count.
+Each route records latency percentiles, SQL statements per call, and the tracemalloc peak of one
+extra call. Python allocations only: driver and OpenCV buffers are not included. extract_text is
+timed over the bundled sample images and generated receipt images. Routes that write use
+throwaway rows created for the run.
+
+With --baseline, the run fails (exit status 1) if a route's p95 grows by more than --threshold
+times (and more than --min-delta-ms), or if it issues more SQL statements than before.
+"""
+import argparse
+import glob
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Request workers only queue OCR jobs, so /upload-receipt is timed without Tesseract
+os.environ.setdefault('OCR_MODE', 'worker')
+
+from flask_jwt_extended import create_access_token  # noqa: E402
+from sqlalchemy import event, insert, literal  # noqa: E402
+
+import backend  # noqa: E402
+from backend import (create_app, db, import_receipts, OcrJob, Receipt, ReceiptAudit, User,  # noqa: E402
+                     UserRole)
+from ocr import extract_text  # noqa: E402
+
+app = create_app()
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE_IMAGES = sorted(glob.glob(os.path.join(BACKEND_DIR, 'uploads', '*.png'))
+                       + glob.glob(os.path.join(BACKEND_DIR, 'uploads', '*.jpeg')))
+# Totals of the bundled samples that are known (as in benchmarks/preprocess.py)
+KNOWN_TOTALS = {"receiptpublix.jpeg": 13.51}
+SCALES = {"1k": 1000, "100k": 100000, "1m": 1000000}
+EMAIL_DOMAIN = "bench.example.com"
+PASSWORD = "benchmark"
+STORES = ["Publix", "Walmart", "Target", "Delta", "Uber", "Home Depot", "Hilton", "Pizza Hut", "Shell", "Costco"]
+ITEMS = ["bananas", "milk", "bread", "unleaded", "hammer", "nails", "room night", "pepperoni", "coffee", "ticket"]
+CATEGORIES = ["Groceries", "Flight", "Transportation", "Materials/Tools", "Lodging", "Meals"]
+STATUSES = ["Pending"] * 12 + ["Approved"] * 5 + ["Rejected"] * 3
+
+
+def parse_scale(value):
+    return SCALES.get(value.lower()) or int(value)
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))] if values else None
+
+
+# Seeding
+
+def receipt_records(count, user_ids, seed=21, start=datetime(2024, 1, 1)):
+    rng = random.Random(seed)
+    for n in range(count):
+        store = rng.choice(STORES)
+        items = [{"name": rng.choice(ITEMS), "amount": f"{rng.uniform(1, 60):.2f}"} for _ in range(rng.randint(1, 4))]
+        yield n, {
+            "user_id": rng.choice(user_ids),
+            "store": store,
+            "category": rng.choice(CATEGORIES),
+            "status": rng.choice(STATUSES),
+            "uploaded_at": (start + timedelta(minutes=rng.randrange(2 * 365 * 24 * 60))).isoformat(),
+            "items": items,
+            "extracted_text": f"{store.upper()}\n" + "\n".join(
+                f"{item['name'].upper()} {item['amount']}" for item in items),
+        }
+
+
+def seed_users(employees, supervisors):
+    """Benchmark users by role; all share PASSWORD, hashed at the configured cost so logins never rehash."""
+    roles = {role.role.lower(): role.id for role in UserRole.query.all()}
+    password_hash = backend.passwords.hash(PASSWORD)
+    wanted = [("admin", 0)] + [("supervisor", n) for n in range(supervisors)] + [("employee", n) for n in range(employees)]
+    existing = {user.email for user in User.query.filter(User.email.like(f"%@{EMAIL_DOMAIN}"))}
+    rows = [{"name": f"Bench {role} {n}", "email": f"{role}{n}@{EMAIL_DOMAIN}", "password_hash": password_hash,
+             "role_id": roles[role]} for role, n in wanted if f"{role}{n}@{EMAIL_DOMAIN}" not in existing]
+    if rows:
+        db.session.execute(insert(User), rows)
+        db.session.commit()
+    users = {"admin": [], "supervisor": [], "employee": []}
+    for user in User.query.filter(User.email.like(f"%@{EMAIL_DOMAIN}")).order_by(User.id):
+        role = user.email.split('@')[0].rstrip('0123456789')
+        if role in users:
+            users[role].append(user.id)
+    return users
+
+
+def seed(receipts, users):
+    start = time.perf_counter()
+    report = import_receipts(receipt_records(receipts, users["employee"]), users["employee"][0])
+    # Decided receipts get the audit row a supervisor's decision would have written
+    db.session.execute(insert(ReceiptAudit).from_select(
+        ['receipt_id', 'supervisor_id', 'action', 'action_timestamp', 'comments'],
+        db.session.query(Receipt.id, literal(users["supervisor"][0]), Receipt.status, Receipt.uploaded_at,
+                         literal("seeded")).filter(Receipt.status != 'Pending',
+                                                   Receipt.user_id.in_(users["employee"])).statement))
+    db.session.commit()
+    return {"receipts": report["imported"], "seconds": round(time.perf_counter() - start, 1)}
+
+
+# Route cases
+
+class Case:
+    """auth is a role (its first benchmark user's token), None, or i -> token."""
+
+    def __init__(self, name, auth, method, path, options=None, max_repeat=None, expect=(200,)):
+        self.name, self.auth, self.method = name, auth, method
+        self.path = path if callable(path) else (lambda i, path=path: path)
+        self.options = options or (lambda i: {})
+        self.max_repeat = max_repeat
+        self.expect = expect
+
+
+def prepare(users, repeat, run_id):
+    """Throwaway rows and tokens for the routes that write, plus a few ids to read."""
+    roles = {role.role.lower(): role.id for role in UserRole.query.all()}
+    tokens = {role: create_access_token(identity=str(ids[0])) for role, ids in users.items()}
+    employee_id = users["employee"][0]
+
+    receipt_ids = [receipt_id for (receipt_id,) in db.session.query(Receipt.id).filter(
+        Receipt.user_id == employee_id).order_by(Receipt.id).limit(200)]
+    import_receipts(((n, {"user_id": employee_id, "store": "Throwaway", "category": "Meals",
+                          "items": [{"name": "x", "amount": "1.00"}]}) for n in range(repeat + 1)), employee_id)
+    deletable = [receipt_id for (receipt_id,) in db.session.query(Receipt.id).filter(
+        Receipt.store_name == "Throwaway", Receipt.user_id == employee_id).order_by(Receipt.id.desc()).limit(repeat + 1)]
+
+    throwaway = backend.passwords.hash("pw0")
+    db.session.execute(insert(User), [{"name": f"Throwaway {n}", "email": f"throwaway-{run_id}-{n}@{EMAIL_DOMAIN}",
+                                       "password_hash": throwaway, "role_id": roles["employee"]}
+                                      for n in range(2 * (repeat + 1) + 2)])
+    job = OcrJob(id=uuid.uuid4().hex, user_id=employee_id, file_path="seeded", status='done',
+                 result=json.dumps({"store_name": "Publix", "category": "Groceries", "total_amount": 13.51}),
+                 finished_at=datetime.utcnow())
+    db.session.add(job)
+    db.session.commit()
+    # repeat + 1 each for /delete-account and /delete-user, then one for role and one for password changes
+    spare_ids = [user_id for (user_id,) in db.session.query(User.id).filter(
+        User.email.like(f"throwaway-{run_id}-%")).order_by(User.id)]
+
+    return {
+        "tokens": tokens,
+        "receipt_ids": receipt_ids,
+        "deletable": deletable,
+        "spare_ids": spare_ids,
+        "spare_tokens": [create_access_token(identity=str(user_id)) for user_id in spare_ids],
+        "ocr_job_id": job.id,
+    }
+
+
+def report_job(client, ctx):
+    """A finished background report job for the job status and download routes."""
+    headers = {"Authorization": f"Bearer {ctx['tokens']['employee']}"}
+    response = client.get('/reports?format=csv&background=true&start_date=2024-01-01&end_date=2024-01-31',
+                          headers=headers)
+    if response.status_code == 200:  # already cached; force a new job with a fresh period
+        response = client.get(f'/reports?format=csv&background=true&start_date=2024-02-01&end_date='
+                              f'2024-02-{random.randint(2, 28):02d}', headers=headers)
+    job_id = response.get_json()["job_id"]
+    for _ in range(600):
+        if client.get(f'/reports/jobs/{job_id}', headers=headers).get_json()["status"] in ('done', 'failed'):
+            break
+        time.sleep(0.1)
+    return job_id
+
+
+def route_cases(ctx, run_id):
+    receipt_ids, deletable, spare_ids, spare_tokens = (ctx["receipt_ids"], ctx["deletable"], ctx["spare_ids"],
+                                                       ctx["spare_tokens"])
+    some_ids = ",".join(map(str, receipt_ids[:50]))
+    with open(SAMPLE_IMAGES[0], 'rb') as f:
+        image = f.read()
+    ndjson = "".join(json.dumps({"store": "Bulk", "category": "Meals", "items": [{"name": "x", "amount": "2.00"}]}) + "\n"
+                     for _ in range(100))
+    runs = (len(spare_ids) - 2) // 2
+
+    return [
+        Case("home", None, "GET", "/"),
+        Case("register", None, "POST", "/register", lambda i: {"json": {
+            "name": "New", "email": f"register-{run_id}-{i}@{EMAIL_DOMAIN}", "password": PASSWORD, "role_id": 1}}),
+        Case("login", None, "POST", "/login", lambda i: {"json": {"email": f"employee0@{EMAIL_DOMAIN}",
+                                                                  "password": PASSWORD}}),
+        Case("all_expense_history", "supervisor", "GET", "/all-expense-history?limit=100"),
+        Case("all_expense_history_ndjson", "supervisor", "GET", "/all-expense-history?format=ndjson&status=Pending"
+             "&start_date=2025-12-01"),
+        Case("upload_receipt", "employee", "POST", "/upload-receipt", lambda i: {
+            "data": {"receipt": (io.BytesIO(image), "receipt.png")},
+            "content_type": "multipart/form-data"}, expect=(200, 202)),
+        Case("ocr_cache_stats", "employee", "GET", "/ocr-cache/stats"),
+        Case("ocr_job", "employee", "GET", f"/ocr-jobs/{ctx['ocr_job_id']}"),
+        Case("ocr_job_events", "employee", "GET", f"/ocr-jobs/{ctx['ocr_job_id']}/events"),
+        Case("manual_receipt", "employee", "POST", "/manual-receipt", lambda i: {"json": {
+            "store": "Manual", "category": "Meals", "items": [{"name": "lunch", "amount": 12.5}]}}, expect=(201,)),
+        Case("bulk_receipts", "admin", "POST", "/bulk-receipts", lambda i: {
+            "data": ndjson, "content_type": "application/x-ndjson"}),
+        Case("fetch_receipts", "supervisor", "GET", "/fetch-receipts?limit=100"),
+        Case("fetch_receipts_employee", "employee", "GET", "/fetch-receipts?limit=100"),
+        Case("user_expense_history", "employee", "GET", "/user-expense-history?limit=100"),
+        Case("statistics_employee", "employee", "GET", "/statistics"),
+        Case("statistics_supervisor", "supervisor", "GET", "/statistics"),
+        Case("statistics_range", "supervisor", "GET", "/statistics?start_date=2025-01-01&end_date=2025-03-31"),
+        Case("search", "supervisor", "GET", "/search?q=home%20depot%20hammer&limit=50"),
+        Case("receipt_details", "employee", "GET", lambda i: f"/receipt-details/{receipt_ids[i % len(receipt_ids)]}"),
+        Case("receipt_details_batch", "employee", "GET", f"/receipt-details?ids={some_ids}"),
+        Case("update_receipt_status", "supervisor", "POST",
+             lambda i: f"/update-receipt-status/{receipt_ids[i % len(receipt_ids)]}",
+             lambda i: {"json": {"status": "Approved" if i % 2 else "Rejected"}}),
+        Case("bulk_update_receipt_status", "supervisor", "POST", "/bulk-update-receipt-status", lambda i: {"json": {
+            "status": "Approved" if i % 2 else "Rejected", "ids": receipt_ids[:100]}}),
+        Case("delete_receipt", "admin", "DELETE", lambda i: f"/delete-receipt/{deletable[i]}"),
+        Case("report_csv", "employee", "GET", "/reports?format=csv&start_date=2024-01-01&end_date=2024-03-31",
+             expect=(200, 202)),
+        Case("report_pdf_org_month", "supervisor", "GET",
+             "/reports?scope=org&format=pdf&start_date=2025-06-01&end_date=2025-06-30", expect=(200, 202)),
+        Case("report_job", "employee", "GET", f"/reports/jobs/{ctx['report_job_id']}"),
+        Case("report_job_download", "employee", "GET", f"/reports/jobs/{ctx['report_job_id']}/download"),
+        Case("audit_logs", "admin", "GET", "/audit-logs?limit=100"),
+        Case("audit_logs_filtered", "admin", "GET", "/audit-logs?action=Approved&start_date=2025-01-01"
+             "&end_date=2025-01-31&limit=100"),
+        Case("all_users", "admin", "GET", "/all-users"),
+        Case("bulk_users", "admin", "POST", "/bulk-users", lambda i: {"json": {"users": [
+            {"name": "Bulk", "email": f"bulk-{run_id}-{i}-{n}@{EMAIL_DOMAIN}", "password": PASSWORD}
+            for n in range(4)]}}, max_repeat=3),
+        Case("update_user_role", "admin", "POST", lambda i: f"/update-user-role/{spare_ids[-2]}",
+             lambda i: {"json": {"role": "Supervisor" if i % 2 else "Employee"}}),
+        Case("change_password", lambda i: spare_tokens[-1], "POST", "/change-password", lambda i: {"json": {
+            "current_password": f"pw{i % 2}", "new_password": f"pw{(i + 1) % 2}"}}),
+        Case("delete_account", lambda i: spare_tokens[i], "DELETE", "/delete-account"),
+        Case("delete_user", "admin", "DELETE", lambda i: f"/delete-user/{spare_ids[runs + i]}"),
+        Case("metrics", None, "GET", "/metrics"),
+    ]
+
+
+def headers_for(case, ctx, i):
+    if case.auth is None:
+        return {}
+    token = case.auth(i) if callable(case.auth) else ctx["tokens"][case.auth]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def time_routes(client, ctx, cases, repeat, only):
+    queries = [0]
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'after_cursor_execute', lambda *args: queries.__setitem__(0, queries[0] + 1))
+    results = {}
+    for case in cases:
+        if only and case.name not in only:
+            continue
+        timings, counts, statuses = [], [], set()
+        runs = min(repeat, case.max_repeat or repeat)
+        for i in range(runs + 1):
+            kwargs = dict(case.options(i), headers=headers_for(case, ctx, i))
+            measure_memory = i == runs
+            if measure_memory:
+                tracemalloc.start()
+            queries[0] = 0
+            start = time.perf_counter()
+            response = client.open(case.path(i), method=case.method, **kwargs)
+            response.get_data()
+            elapsed = (time.perf_counter() - start) * 1000
+            statuses.add(response.status_code)
+            if measure_memory:
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+            else:
+                timings.append(elapsed)
+                counts.append(queries[0])
+        results[case.name] = {
+            "calls": len(timings),
+            "p50_ms": round(percentile(timings, 0.5), 2),
+            "p95_ms": round(percentile(timings, 0.95), 2),
+            "p99_ms": round(percentile(timings, 0.99), 2),
+            "queries": statistics.median(counts),
+            "peak_kb": round(peak / 1024),
+            "statuses": sorted(statuses),
+            "ok": statuses <= set(case.expect),
+        }
+        row = results[case.name]
+        print(f"  {case.name:<30} p50 {row['p50_ms']:>8.1f} ms  p95 {row['p95_ms']:>8.1f} ms  "
+              f"{row['queries']:>5} queries  peak {row['peak_kb']:>7} KB  {row['statuses']}"
+              + ("" if row["ok"] else "  UNEXPECTED STATUS"))
+    return results
+
+
+# OCR
+
+def generated_receipts(directory, count, seed=5):
+    """Synthetic receipt photos with a known total, drawn with OpenCV."""
+    import cv2
+    import numpy as np
+
+    rng = random.Random(seed)
+    images = {}
+    for n in range(count):
+        items = [(rng.choice(ITEMS).upper(), rng.uniform(1, 40)) for _ in range(rng.randint(3, 12))]
+        total = round(sum(amount for _, amount in items), 2)
+        lines = [rng.choice(STORES).upper(), "123 MAIN ST", "", *(f"{name:<18}{amount:>8.2f}" for name, amount in items),
+                 "", f"{'TOTAL':<18}{total:>8.2f}", "THANK YOU"]
+        image = np.full((80 + 40 * len(lines), 720), 255, dtype=np.uint8)
+        for row, line in enumerate(lines):
+            cv2.putText(image, line, (30, 60 + 40 * row), cv2.FONT_HERSHEY_SIMPLEX, 0.9, 0, 2, cv2.LINE_AA)
+        # A slight rotation and noise, like a phone photo
+        matrix = cv2.getRotationMatrix2D((image.shape[1] / 2, image.shape[0] / 2), rng.uniform(-3, 3), 1.0)
+        image = cv2.warpAffine(image, matrix, (image.shape[1], image.shape[0]), borderValue=255)
+        image = cv2.add(image, np.random.default_rng(n).integers(0, 25, image.shape, dtype=np.uint8))
+        path = os.path.join(directory, f"generated-{n}.png")
+        cv2.imwrite(path, image)
+        images[path] = total
+    return images
+
+
+def time_ocr(images, repeat):
+    timings, stages, correct, errors = [], {}, 0, []
+    peak = 0
+    for path, expected in images.items():
+        for i in range(repeat):
+            if i == 0:
+                tracemalloc.start()
+            start = time.perf_counter()
+            try:
+                result = extract_text(path)
+            except Exception as e:  # e.g. no tesseract binary
+                result = {"error": str(e)}
+            elapsed = (time.perf_counter() - start) * 1000
+            if i == 0:
+                peak = max(peak, tracemalloc.get_traced_memory()[1])
+                tracemalloc.stop()
+            if "error" in result:
+                errors.append(f"{os.path.basename(path)}: {result['error']}")
+                break
+            timings.append(elapsed)
+            for stage, ms in result["timings"].items():
+                stages.setdefault(stage, []).append(ms)
+            if i == 0 and expected is not None and result["amount"] is not None:
+                correct += abs(result["amount"] - expected) < 0.005
+    if not timings:
+        return {"skipped": errors[0] if errors else "no images"}
+    checked = sum(expected is not None for expected in images.values())
+    return {
+        "images": len(images),
+        "calls": len(timings),
+        "p50_ms": round(percentile(timings, 0.5), 1),
+        "p95_ms": round(percentile(timings, 0.95), 1),
+        "stage_mean_ms": {stage: round(statistics.mean(values), 2) for stage, values in stages.items()},
+        "totals_correct": f"{correct}/{checked}",
+        "peak_kb": round(peak / 1024),
+        "errors": errors,
+    }
+
+
+# Comparison
+
+def compare(results, baseline, threshold, min_delta_ms):
+    """Regressions of results against baseline; p95 must grow by both the ratio and the absolute delta."""
+    regressions = []
+    if results["meta"].get("receipts") != baseline["meta"].get("receipts"):
+        print(f"warning: comparing {results['meta'].get('receipts')} receipts against a baseline of "
+              f"{baseline['meta'].get('receipts')}")
+    sections = [(f"route {name}", row, baseline.get("routes", {}).get(name)) for name, row in results["routes"].items()]
+    if "p95_ms" in results.get("ocr", {}):
+        sections.append(("ocr extract_text", results["ocr"], baseline.get("ocr")))
+    for label, current, previous in sections:
+        if not previous or "p95_ms" not in previous:
+            continue
+        if current["p95_ms"] > previous["p95_ms"] * threshold and current["p95_ms"] - previous["p95_ms"] > min_delta_ms:
+            regressions.append(f"{label}: p95 {previous['p95_ms']} -> {current['p95_ms']} ms")
+        if "queries" in current and current["queries"] > previous.get("queries", current["queries"]):
+            regressions.append(f"{label}: {previous['queries']} -> {current['queries']} queries")
+    return regressions
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scale', default="1k", help="1k, 100k, 1m or a number of receipts")
+    parser.add_argument('--employees', type=int, default=50)
+    parser.add_argument('--supervisors', type=int, default=5)
+    parser.add_argument('--no-seed', action='store_true', help="reuse a database seeded by an earlier run")
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--only', default="", help="comma-separated route names, or 'ocr' / 'routes'")
+    parser.add_argument('--ocr-generated', type=int, default=5, help="generated receipt images to OCR")
+    parser.add_argument('--ocr-repeat', type=int, default=3)
+    parser.add_argument('--output', help="write the results as JSON")
+    parser.add_argument('--baseline', help="results JSON of an earlier run to compare against")
+    parser.add_argument('--threshold', type=float, default=1.25, help="allowed p95 growth ratio")
+    parser.add_argument('--min-delta-ms', type=float, default=2.0, help="ignore p95 changes smaller than this")
+    args = parser.parse_args()
+
+    only = {name for name in args.only.split(',') if name}
+    receipts = parse_scale(args.scale)
+    run_id = uuid.uuid4().hex[:8]
+    results = {"meta": {
+        "receipts": receipts, "commit": git_commit(), "started_at": datetime.utcnow().isoformat(timespec='seconds'),
+        "python": platform.python_version(), "machine": platform.machine(), "repeat": args.repeat,
+    }, "routes": {}}
+
+    if only != {"ocr"}:
+        client = app.test_client()
+        with app.app_context():
+            results["meta"]["database"] = db.engine.dialect.name
+            users = seed_users(args.employees, args.supervisors)
+            if not args.no_seed:
+                results["meta"]["seed"] = seed(receipts, users)
+                print(f"seeded {results['meta']['seed']['receipts']} receipts in {results['meta']['seed']['seconds']}s")
+            ctx = prepare(users, args.repeat, run_id)
+        ctx["report_job_id"] = report_job(client, ctx)
+        print(f"routes ({results['meta']['database']}, {receipts} receipts):")
+        results["routes"] = time_routes(client, ctx, route_cases(ctx, run_id), args.repeat, only - {"routes"})
+
+    if not only or "ocr" in only:
+        with tempfile.TemporaryDirectory() as tmp:
+            images = {path: KNOWN_TOTALS.get(os.path.basename(path)) for path in SAMPLE_IMAGES}
+            images.update(generated_receipts(tmp, args.ocr_generated))
+            results["ocr"] = time_ocr(images, args.ocr_repeat)
+        print(f"extract_text: {json.dumps(results['ocr'])}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"wrote {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.threshold, args.min_delta_ms)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print("no regressions")
+
+
+if __name__ == '__main__':
+    main()
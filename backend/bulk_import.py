@@ -0,0 +1,119 @@
+import csv
+import io
+import json
+import math
+from datetime import datetime
+from itertools import groupby
+
+RECEIPT_STATUSES = ('Pending', 'Approved', 'Rejected')
+# receipts.amount and receipt_items.amount are NUMERIC(10, 2)
+MAX_AMOUNT = 99999999.99
+CSV_COLUMNS = ['receipt_ref', 'user_id', 'store', 'category', 'status', 'uploaded_at', 'item_name', 'item_amount']
+
+
+def iter_ndjson(stream):
+    """Yield (row number, record) from NDJSON text; malformed lines yield a ValueError as the record."""
+    for number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            if not isinstance(record, dict):
+                raise ValueError("Expected a JSON object")
+        except ValueError as e:
+            record = ValueError(f"Invalid JSON: {e}")
+        yield number, record
+
+
+def iter_csv(stream):
+    """Yield (row number, record) from CSV with one row per item (columns in CSV_COLUMNS).
+
+    Consecutive rows sharing a receipt_ref make up one receipt; the row number reported is
+    that of the receipt's first row.
+    """
+    reader = csv.DictReader(stream)
+    rows = ((number, row) for number, row in enumerate(reader, start=2))
+    for _, group in groupby(rows, key=lambda pair: pair[1].get('receipt_ref')):
+        group = list(group)
+        number, first = group[0]
+        record = {key: first.get(key) for key in CSV_COLUMNS if key not in ('receipt_ref', 'item_name', 'item_amount')}
+        record['items'] = [
+            {"name": row.get('item_name'), "amount": row.get('item_amount')}
+            for _, row in group if row.get('item_name') or row.get('item_amount')
+        ]
+        yield number, record
+
+
+def iter_records(stream, fmt):
+    if isinstance(stream, (bytes, bytearray)):
+        stream = io.StringIO(stream.decode('utf-8'))
+    return iter_csv(stream) if fmt == 'csv' else iter_ndjson(stream)
+
+
+def validate_record(record, default_user_id, now=None):
+    """Turn one record into (receipt row, item rows) or raise ValueError.
+
+    Items follow /manual-receipt: blank or zero amounts are dropped and the receipt amount is
+    the sum of the remaining items.
+    """
+    if isinstance(record, Exception):
+        raise record
+
+    category = (text_field(record.get('category'), "category") or '').strip()
+    if not category:
+        raise ValueError("category is required")
+    if len(category) > 50:
+        raise ValueError("category is longer than 50 characters")
+    store = text_field(record.get('store') or record.get('store_name'), "store", 50)
+
+    status = record.get('status') or 'Pending'
+    if status not in RECEIPT_STATUSES:
+        raise ValueError(f"status must be one of {', '.join(RECEIPT_STATUSES)}")
+
+    try:
+        user_id = int(record.get('user_id') or default_user_id)
+        uploaded_at = datetime.fromisoformat(record['uploaded_at']) if record.get('uploaded_at') else (now or datetime.utcnow())
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid user_id or uploaded_at: {e}")
+
+    raw_items = record.get('items') or []
+    if not isinstance(raw_items, list):
+        raise ValueError("items must be a list")
+    items = []
+    for item in raw_items:
+        if not isinstance(item, dict) or item.get('amount') in [None, '', 0]:
+            continue
+        try:
+            amount = round(float(item['amount']), 2)
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid item amount: {item.get('amount')!r}")
+        # float() accepts "inf" and "nan", which the NUMERIC columns reject
+        if not math.isfinite(amount) or abs(amount) > MAX_AMOUNT:
+            raise ValueError(f"Invalid item amount: {item.get('amount')!r}")
+        name = text_field(item.get('name'), "item name", 255) or 'Unknown Item'
+        items.append({"item_name": name, "amount": amount})
+
+    amount = sum(item["amount"] for item in items)
+    if abs(amount) > MAX_AMOUNT:
+        raise ValueError("receipt total is out of range")
+    receipt = {
+        "user_id": user_id,
+        "store_name": store,
+        "category": category,
+        "status": status,
+        "uploaded_at": uploaded_at,
+        "amount": amount,
+        "extracted_text": text_field(record.get('extracted_text'), "extracted_text"),
+    }
+    return receipt, items
+
+
+def text_field(value, name, max_length=None):
+    """value, which must be a string (or None) of at most max_length characters; ValueError otherwise."""
+    if value is None:
+        return None
+    if not isinstance(value, str):
+        raise ValueError(f"{name} must be a string")
+    if max_length and len(value) > max_length:
+        raise ValueError(f"{name} is longer than {max_length} characters")
+    return value
@@ -0,0 +1,95 @@
+# pylint: disable=no-member
+import cv2
+import hashlib
+import numpy as np
+import os
+import re
+from datetime import timedelta
+from decimal import Decimal, ROUND_HALF_UP
+from ocr import is_pdf, rasterize_page
+
+# Perceptual hashes are 64 bits, searched as PHASH_BLOCKS exact-match blocks (multi-index hashing):
+# two hashes within MAX_PHASH_DISTANCE bits differ in at most that many blocks, so they agree on at
+# least PHASH_MIN_MATCHING_BLOCKS whole blocks. A re-photographed receipt (slightly rotated, rescaled
+# and recompressed) lands 8-12 bits away; larger distances need narrower blocks, whose lookups read
+# more of receipt_phash_blocks, up to 16 blocks of 4 bits for 15
+PHASH_BITS = 64
+MAX_PHASH_DISTANCE = min(int(os.environ.get('DUPLICATE_PHASH_DISTANCE', 10)), 15)
+PHASH_BLOCKS = next(blocks for blocks in (4, 8, 16) if blocks > MAX_PHASH_DISTANCE)
+PHASH_BLOCK_BITS = PHASH_BITS // PHASH_BLOCKS
+PHASH_MIN_MATCHING_BLOCKS = PHASH_BLOCKS - MAX_PHASH_DISTANCE
+# Block ids carry the block width, so rows indexed under another distance setting never match
+PHASH_BLOCK_IDS = range(PHASH_BLOCK_BITS * 100, PHASH_BLOCK_BITS * 100 + PHASH_BLOCKS)
+# Receipts with the same fingerprint are duplicates when uploaded this close together
+FINGERPRINT_WINDOW = timedelta(days=int(os.environ.get('DUPLICATE_WINDOW_DAYS', 90)))
+
+WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def to_signed(value):
+    # Stored in a BIGINT column, which is signed
+    return value - (1 << PHASH_BITS) if value >= 1 << (PHASH_BITS - 1) else value
+
+
+def phash_blocks(phash):
+    """[(block id, value)] for the receipt_phash_blocks rows of a hash."""
+    unsigned = phash & ((1 << PHASH_BITS) - 1)
+    mask = (1 << PHASH_BLOCK_BITS) - 1
+    return [(block_id, (unsigned >> (block * PHASH_BLOCK_BITS)) & mask)
+            for block, block_id in enumerate(PHASH_BLOCK_IDS)]
+
+
+def hamming(a, b):
+    return bin((a ^ b) & ((1 << PHASH_BITS) - 1)).count('1')
+
+
+def image_phash(image):
+    """DCT perceptual hash: the signs of the 8x8 lowest frequencies of a 32x32 thumbnail against
+    their median, so rescaling, recompression and small lighting changes barely move it."""
+    if image.ndim == 3:
+        image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    thumbnail = cv2.resize(image, (32, 32), interpolation=cv2.INTER_AREA).astype(np.float32)
+    low = cv2.dct(thumbnail)[:8, :8].flatten()
+    bits = low > np.median(low[1:])  # the DC term would dominate the median
+    value = 0
+    for bit in bits:
+        value = (value << 1) | int(bit)
+    return to_signed(value)
+
+
+def file_phash(path):
+    """Perceptual hash of an uploaded image (or a PDF's first page), or None if it can't be read."""
+    try:
+        if is_pdf(path):
+            image = rasterize_page(path, 0, dpi=72)
+        else:
+            # The hash only needs a thumbnail, so let the decoder skip most of the pixels
+            image = cv2.imread(path, cv2.IMREAD_REDUCED_GRAYSCALE_4)
+    except Exception:  # PyMuPDF missing or an unreadable PDF
+        return None
+    return None if image is None else image_phash(image)
+
+
+def normalize_text(value):
+    return " ".join(WORD_RE.findall(str(value or "").lower()))
+
+
+def whole_cents(amount):
+    """An amount as an int number of cents for fingerprints; blank and non-finite amounts are 0."""
+    if amount in (None, ''):
+        return 0
+    amount = Decimal(str(amount))
+    if not amount.is_finite():  # quantize() raises InvalidOperation on inf and nan
+        return 0
+    return int((amount * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def receipt_fingerprint(store_name, amount, items):
+    """SHA-256 of the normalized store name, total and (name, amount) item multiset, so the same
+    receipt typed in by hand and read by OCR match whatever the item order, case or punctuation.
+    None for receipts with no total and no items, which would all collide."""
+    lines = sorted(f"{normalize_text(name)}:{whole_cents(item_amount)}" for name, item_amount in items)
+    if not lines and not whole_cents(amount):
+        return None
+    document = "\n".join([normalize_text(store_name), str(whole_cents(amount))] + lines)
+    return hashlib.sha256(document.encode('utf-8')).hexdigest()
@@ -1,5 +1,9 @@
+-- Reference schema. The migrations in backend/migrations are the source of truth:
+--   flask --app backend db upgrade
+-- A database created from this file should be stamped at 0001 (db stamp 0001) and then upgraded.
+
 -- Drop existing tables if they exist
-DROP TABLE IF EXISTS receipt_audit, receipts, users, permissions, user_roles, expenses, expense_items CASCADE;
+DROP TABLE IF EXISTS receipt_items, receipt_audit, receipts, users, permissions, user_roles, expenses, expense_items CASCADE;
 
 -- Create User Roles Table
 CREATE TABLE user_roles (
@@ -45,25 +49,41 @@ CREATE TABLE users (
 -- Create Receipts Table
 CREATE TABLE receipts (
     id SERIAL PRIMARY KEY,
-    user_id INT REFERENCES users(id) ON DELETE CASCADE,
-    category VARCHAR(50) DEFAULT 'Unknown',
+    user_id INT NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    category VARCHAR(50) NOT NULL DEFAULT 'Unknown',
     amount DECIMAL(10,2) DEFAULT NULL,
-    status VARCHAR(20) CHECK (status IN ('Pending', 'Approved', 'Rejected')) DEFAULT 'Pending',
-    uploaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    status VARCHAR(20) NOT NULL CHECK (status IN ('Pending', 'Approved', 'Rejected')) DEFAULT 'Pending',
+    uploaded_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
     extracted_text TEXT,
     store_name VARCHAR(50) DEFAULT 'Unknown'
 );
 
+CREATE INDEX ix_receipts_user_id_uploaded_at ON receipts (user_id, uploaded_at DESC);
+CREATE INDEX ix_receipts_uploaded_at_id ON receipts (uploaded_at DESC, id DESC);
+CREATE INDEX ix_receipts_pending ON receipts (status) WHERE status = 'Pending';
+
+-- Items on each receipt
+CREATE TABLE receipt_items (
+    id SERIAL PRIMARY KEY,
+    receipt_id INT NOT NULL REFERENCES receipts(id) ON DELETE CASCADE,
+    item_name VARCHAR(255) NOT NULL,
+    amount NUMERIC(10, 2) NOT NULL
+);
+
+CREATE INDEX ix_receipt_items_receipt_id ON receipt_items (receipt_id);
+
 -- Create Audit Log for Approvals/Rejections
 CREATE TABLE receipt_audit (
     id SERIAL PRIMARY KEY,
-    receipt_id INT REFERENCES receipts(id) ON DELETE CASCADE,
+    receipt_id INT NOT NULL REFERENCES receipts(id) ON DELETE CASCADE,
     supervisor_id INT REFERENCES users(id) ON DELETE SET NULL,
     action VARCHAR(20) CHECK (action IN ('Approved', 'Rejected')) NOT NULL,
-    action_timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    action_timestamp TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
     comments TEXT
 );
 
+CREATE INDEX ix_receipt_audit_receipt_id ON receipt_audit (receipt_id);
+
 -- Insert a few test users
 INSERT INTO users (name, role_id, email, password_hash)
 VALUES 
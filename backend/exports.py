@@ -0,0 +1,182 @@
+import json
+import os
+
+# Rows per Arrow record batch, which is also the Parquet row group size; memory stays at about one batch
+EXPORT_BATCH_ROWS = int(os.environ.get('EXPORT_BATCH_ROWS', 10000))
+ARROW_STREAM_MIMETYPE = "application/vnd.apache.arrow.stream"
+WATERMARKS_FILE = "_watermarks.json"
+
+# Exported tables: columns in select order, the timestamp rows are ordered and partitioned by, and
+# the id that breaks ties on it. (time, key) of the last row exported is the table's watermark.
+# The times are creation times, so incremental exports are append-only: a receipt edited after
+# it was exported (items rewritten by reocr, a duplicate flag cleared, a delete) keeps its old
+# exported copy, and only a periodic full re-export picks the edit up. Status changes arrive as
+# receipt_audit rows.
+EXPORT_TABLES = {
+    "receipts": {
+        "columns": [("id", "int32"), ("user_id", "int32"), ("uploaded_at", "timestamp"), ("store_name", "string"),
+                    ("category", "string"), ("status", "string"), ("amount", "decimal"),
+                    ("image_hash", "string"), ("duplicate_of_id", "int32")],
+        "time": "uploaded_at",
+        "key": "id",
+    },
+    # Items carry their receipt's uploaded_at, so they partition and resume alongside it
+    "receipt_items": {
+        "columns": [("id", "int32"), ("receipt_id", "int32"), ("uploaded_at", "timestamp"),
+                    ("item_name", "string"), ("amount", "decimal")],
+        "time": "uploaded_at",
+        "key": "receipt_id",
+    },
+    "receipt_audit": {
+        "columns": [("id", "int32"), ("receipt_id", "int32"), ("supervisor_id", "int32"), ("action", "string"),
+                    ("action_timestamp", "timestamp"), ("comments", "string")],
+        "time": "action_timestamp",
+        "key": "id",
+    },
+}
+
+
+def import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise RuntimeError("Parquet/Arrow exports need pyarrow (pip install pyarrow)") from e
+    return pyarrow, pyarrow.parquet
+
+
+def arrow_schema(table):
+    pa, _ = import_pyarrow()
+    types = {
+        "int32": pa.int32(),
+        "string": pa.string(),
+        "decimal": pa.decimal128(10, 2),  # NUMERIC(10, 2), as in the database
+        "timestamp": pa.timestamp('us', tz='UTC'),  # the database stores naive UTC
+    }
+    return pa.schema([(name, types[kind]) for name, kind in EXPORT_TABLES[table]["columns"]])
+
+
+def record_batches(rows, table, batch_rows=EXPORT_BATCH_ROWS):
+    """Yield (month, RecordBatch) from rows in time order. A batch never spans two months,
+    so each one belongs to exactly one monthly partition."""
+    pa, _ = import_pyarrow()
+    schema = arrow_schema(table)
+    time_index = [name for name, _ in EXPORT_TABLES[table]["columns"]].index(EXPORT_TABLES[table]["time"])
+    columns = [[] for _ in schema]
+    month = None
+
+    def flush():
+        batch = pa.RecordBatch.from_arrays([pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+                                           schema=schema)
+        for values in columns:
+            values.clear()
+        return month, batch
+
+    for row in rows:
+        row_month = row[time_index].strftime('%Y-%m')
+        if columns[0] and (row_month != month or len(columns[0]) >= batch_rows):
+            yield flush()
+        month = row_month
+        for values, value in zip(columns, row):
+            values.append(value)
+    if columns[0]:
+        yield flush()
+
+
+class ChunkSink:
+    """Write-only file object that hands back what was written since the last take()."""
+
+    def __init__(self):
+        self.chunks = []
+        self.closed = False
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def take(self):
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def iter_arrow_stream(batches, table):
+    """Yield an Arrow IPC stream as bytes, one chunk per record batch."""
+    pa, _ = import_pyarrow()
+    sink = ChunkSink()
+    with pa.ipc.new_stream(sink, arrow_schema(table)) as writer:
+        yield sink.take()  # the schema message, so clients can start before the first batch
+        for _, batch in batches:
+            writer.write_batch(batch)
+            yield sink.take()
+    yield sink.take()  # end-of-stream marker
+
+
+def batch_watermark(table, batch):
+    """(time, key) of a batch's last row, with the time back in the database's naive UTC."""
+    spec = EXPORT_TABLES[table]
+    moment = batch.column(spec["time"])[-1].as_py()
+    return moment.replace(tzinfo=None), batch.column(spec["key"])[-1].as_py()
+
+
+def write_parquet(batches, directory, table, run_id, on_file=None):
+    """Write batches to directory/<table>/month=YYYY-MM/part-<run_id>.parquet (Hive-style
+    partitions), one file per month touched. Files are renamed into place only once complete,
+    so readers never see a partial file, and on_file gets the watermark each finished file
+    reaches. Returns {"rows", "files", "bytes"}."""
+    _, pq = import_pyarrow()
+    stats = {"rows": 0, "files": 0, "bytes": 0}
+    writer, path, current, last_batch = None, None, None, None
+
+    def close():
+        writer.close()
+        os.replace(f"{path}.tmp", path)
+        stats["files"] += 1
+        stats["bytes"] += os.path.getsize(path)
+        if on_file:
+            on_file(batch_watermark(table, last_batch))
+
+    try:
+        for month, batch in batches:
+            if month != current:
+                if writer:
+                    close()
+                    writer = None
+                partition = os.path.join(directory, table, f"month={month}")
+                os.makedirs(partition, exist_ok=True)
+                path = os.path.join(partition, f"part-{run_id}.parquet")
+                writer = pq.ParquetWriter(f"{path}.tmp", batch.schema, compression='zstd')
+                current = month
+            writer.write_batch(batch)
+            last_batch = batch
+            stats["rows"] += batch.num_rows
+        if writer:
+            close()
+            writer = None
+    finally:
+        if writer:  # failed mid-month: drop the partial file
+            writer.close()
+            os.remove(f"{path}.tmp")
+    return stats
+
+
+def read_watermarks(directory):
+    try:
+        with open(os.path.join(directory, WATERMARKS_FILE), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_watermarks(directory, watermarks):
+    # Write-then-rename, like the reocr checkpoint
+    path = os.path.join(directory, WATERMARKS_FILE)
+    with open(f"{path}.tmp", 'w', encoding='utf-8') as f:
+        json.dump(watermarks, f, indent=2)
+    os.replace(f"{path}.tmp", path)
@@ -0,0 +1,65 @@
+"""gunicorn -c gunicorn.conf.py wsgi:app (from backend/)
+
+Every worker process gets its own SQLAlchemy pool, so the database sees up to
+workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections; keep that under max_connections.
+"""
+import multiprocessing
+import os
+import sys
+import time
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+# sync, gthread or gevent. /ocr-jobs/<id>?wait and the SSE stream hold a request open for up
+# to OCR_JOB_MAX_WAIT seconds, which ties up a whole sync worker; gthread or gevent do not.
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'sync')
+threads = int(os.environ.get('GUNICORN_THREADS', 1))
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 1000))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 60))
+graceful_timeout = 30
+keepalive = 5
+# Restart workers now and then to bound slow leaks (PDF rendering, OCR result caches)
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 2000))
+max_requests_jitter = max_requests // 10
+
+# Request workers only queue OCR jobs; run `flask --app backend ocr-worker` next to them
+os.environ.setdefault('OCR_MODE', 'worker')
+# Cancel runaway queries instead of letting them hold a worker and a connection
+os.environ.setdefault('STATEMENT_TIMEOUT_MS', '30000')
+
+
+def pre_fork(server, worker):
+    # Runs in the master: only the first worker forked after startup gets the startup tasks
+    worker.run_startup_tasks = not getattr(server, 'startup_tasks_assigned', False)
+    server.startup_tasks_assigned = True
+
+
+def post_worker_init(worker):
+    # Audit partitions and resuming queued jobs (backend.run_startup_tasks) need the app and
+    # must run once, in a process that owns a report pool, so not in the master
+    if worker.run_startup_tasks:
+        from backend import run_startup_tasks
+        from wsgi import app
+        with app.app_context():
+            run_startup_tasks()
+
+
+def worker_exit(server, worker):
+    # Dumps are rate-limited; write the last second of this worker's metrics before it goes
+    backend = sys.modules.get('backend')  # not there if the worker failed to boot
+    if backend:
+        backend.registry.dump(time.monotonic(), force=True)
+
+
+def child_exit(server, worker):
+    # Runs in the master once a worker is gone: fold its metrics into METRICS_DIR's stale totals
+    if os.environ.get('METRICS_DIR'):
+        from metrics import mark_process_dead
+        mark_process_dead(os.environ['METRICS_DIR'], worker.pid)
+
+
+def post_fork(server, worker):
+    if worker_class == 'gevent':
+        # psycopg2 blocks the whole worker on I/O unless it yields to the gevent hub
+        from psycogreen.gevent import patch_psycopg
+        patch_psycopg()
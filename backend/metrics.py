@@ -0,0 +1,212 @@
+import json
+import math
+import os
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# Prometheus' default latency buckets, in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+# Totals of exited processes in a METRICS_DIR, so counters never go backwards when workers restart
+STALE_FILE = "stale.json"
+
+
+def format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def format_labels(labels):
+    if not labels:
+        return ""
+    escaped = (str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"') for _, value in labels)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(labels, escaped)) + "}"
+
+
+class Counter:
+    type = "counter"
+
+    def __init__(self, registry, name, documentation, labelnames=()):
+        self.name, self.documentation, self.labelnames = name, documentation, tuple(labelnames)
+        self._values = {}
+        self._lock = registry.lock
+        registry.register(self)
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels[name] for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            return [(self.name, tuple(zip(self.labelnames, key)), value) for key, value in self._values.items()]
+
+
+class Histogram:
+    type = "histogram"
+
+    def __init__(self, registry, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name, self.documentation, self.labelnames = name, documentation, tuple(labelnames)
+        self.buckets = tuple(buckets) + (math.inf,)
+        self._values = {}  # label values -> [per-bucket counts..., sum]
+        self._lock = registry.lock
+        registry.register(self)
+
+    def observe(self, value, **labels):
+        key = tuple(labels[name] for name in self.labelnames)
+        with self._lock:
+            counts = self._values.setdefault(key, [0] * len(self.buckets) + [0.0])
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+                    break
+            counts[-1] += value
+
+    def samples(self):
+        samples = []
+        with self._lock:
+            for key, counts in self._values.items():
+                labels = tuple(zip(self.labelnames, key))
+                cumulative = 0
+                for bound, count in zip(self.buckets, counts):
+                    cumulative += count
+                    samples.append((f"{self.name}_bucket", labels + (("le", format_value(bound)),), cumulative))
+                samples.append((f"{self.name}_sum", labels, counts[-1]))
+                samples.append((f"{self.name}_count", labels, cumulative))
+        return samples
+
+
+class Gauge:
+    """Read at scrape time from a callback returning a number or {label values tuple: number}."""
+    type = "gauge"
+
+    def __init__(self, registry, name, documentation, callback, labelnames=()):
+        self.name, self.documentation, self.labelnames = name, documentation, tuple(labelnames)
+        self.callback = callback
+        registry.register(self, aggregate=False)
+
+    def samples(self):
+        values = self.callback()
+        if not isinstance(values, dict):
+            values = {(): values}
+        return [(self.name, tuple(zip(self.labelnames, key)), value) for key, value in values.items()]
+
+
+class Registry:
+    """In-process metrics rendered in the Prometheus text format.
+
+    With a directory (METRICS_DIR), every process (gunicorn workers, the OCR worker) also dumps its
+    counters and histograms there, and render() sums all dumps, so a scrape sees the whole
+    deployment instead of the one worker that answered. Gauges are always read live. Dumps of
+    exited processes are folded into STALE_FILE (see mark_process_dead).
+    """
+
+    def __init__(self, directory=None, dump_interval=1.0):
+        self.lock = threading.Lock()
+        self.directory = directory
+        self.dump_interval = dump_interval
+        self._metrics = []
+        self._aggregated = set()
+        self._last_dump = 0.0
+        self._dumped_pid = None
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def register(self, metric, aggregate=True):
+        self._metrics.append(metric)
+        if aggregate:
+            self._aggregated.add(metric.name)
+
+    def _local_samples(self):
+        return {metric.name: metric.samples() for metric in self._metrics if metric.name in self._aggregated}
+
+    def dump(self, now, force=False):
+        """Write this process' samples to directory/<pid>.json, at most once per dump_interval."""
+        if not self.directory or (not force and now - self._last_dump < self.dump_interval):
+            return
+        self._last_dump = now
+        if self._dumped_pid != os.getpid():
+            # A file under our pid is left from an exited process that reused it: keep its totals
+            mark_process_dead(self.directory, os.getpid())
+            self._dumped_pid = os.getpid()
+        write_dump(os.path.join(self.directory, f"{os.getpid()}.json"), self._local_samples())
+
+    def _aggregated_samples(self):
+        if not self.directory:
+            return self._local_samples()
+        # Until this process has dumped, a file under its pid belongs to an exited process
+        own = f"{os.getpid()}.json" if self._dumped_pid == os.getpid() else None
+        dumps = [self._local_samples()]
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.json') and entry.name != own:
+                dump = read_dump(entry.path)
+                if dump is not None:
+                    dumps.append(dump)
+        return sum_dumps(dumps)
+
+    def render(self):
+        aggregated = self._aggregated_samples()
+        lines = []
+        for metric in self._metrics:
+            rows = aggregated.get(metric.name, []) if metric.name in self._aggregated else metric.samples()
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(f"{sample}{format_labels(labels)} {format_value(value)}" for sample, labels, value in rows)
+        return "\n".join(lines) + "\n"
+
+
+def read_dump(path):
+    """{metric name: [(sample, labels, value)]} from a dump file, or None if it is gone or partial."""
+    try:
+        with open(path, encoding='utf-8') as f:
+            return {name: [(sample, tuple(map(tuple, labels)), value) for sample, labels, value in rows]
+                    for name, rows in json.load(f).items()}
+    except (OSError, ValueError):
+        return None
+
+
+def sum_dumps(dumps):
+    totals = {}
+    for dump in dumps:
+        for name, rows in dump.items():
+            series = totals.setdefault(name, {})
+            for sample, labels, value in rows:
+                series[(sample, labels)] = series.get((sample, labels), 0) + value
+    return {name: [(sample, labels, value) for (sample, labels), value in series.items()]
+            for name, series in totals.items()}
+
+
+def write_dump(path, samples):
+    # Write-then-rename, so readers never see a partial file
+    with open(f"{path}.tmp", 'w', encoding='utf-8') as f:
+        json.dump({name: [[sample, list(map(list, labels)), value] for sample, labels, value in rows]
+                   for name, rows in samples.items()}, f)
+    os.replace(f"{path}.tmp", path)
+
+
+def mark_process_dead(directory, pid):
+    """Fold an exited process' dump into STALE_FILE and remove it, like prometheus_client's
+    multiprocess mode: its counts stay in the totals, and a new process reusing the pid starts
+    from zero without overwriting them. gunicorn.conf.py calls this from child_exit."""
+    path = os.path.join(directory, f"{pid}.json")
+    dump = read_dump(path)
+    if dump is None:
+        return
+    with stale_lock(directory):
+        stale_path = os.path.join(directory, STALE_FILE)
+        write_dump(stale_path, sum_dumps([read_dump(stale_path) or {}, dump]))
+        os.remove(path)
+
+
+@contextmanager
+def stale_lock(directory):
+    # Exclusive across processes; without fcntl (Windows) only the single-process dev server runs
+    with open(os.path.join(directory, "stale.lock"), 'a', encoding='utf-8') as f:
+        if fcntl:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        yield
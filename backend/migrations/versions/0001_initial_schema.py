@@ -0,0 +1,79 @@
+"""Initial schema, as created by eeris.sql
+
+Databases that were built from eeris.sql before migrations existed should be
+marked as already at this revision rather than upgraded through it:
+
+    flask --app backend db stamp 0001
+    flask --app backend db upgrade
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 09:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    user_roles = op.create_table(
+        'user_roles',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('role', sa.String(20), nullable=False, unique=True),
+        sa.Column('description', sa.Text()),
+    )
+    op.bulk_insert(user_roles, [
+        {'role': 'Employee', 'description': 'Can submit receipts'},
+        {'role': 'Supervisor', 'description': 'Can approve/reject receipts'},
+        {'role': 'Admin', 'description': 'Can manage users and receipts'},
+    ])
+
+    op.create_table(
+        'users',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('name', sa.String(100), nullable=False),
+        sa.Column('role_id', sa.Integer(), sa.ForeignKey('user_roles.id', ondelete='SET NULL')),
+        sa.Column('email', sa.String(100), nullable=False, unique=True),
+        sa.Column('password_hash', sa.Text(), nullable=False),
+    )
+
+    op.create_table(
+        'receipts',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE')),
+        sa.Column('category', sa.String(50), server_default='Unknown'),
+        sa.Column('amount', sa.Numeric(10, 2)),
+        sa.Column('status', sa.String(20), server_default='Pending'),
+        sa.Column('uploaded_at', sa.DateTime(), server_default=sa.func.current_timestamp()),
+        sa.Column('extracted_text', sa.Text()),
+        sa.Column('store_name', sa.String(50), server_default='Unknown'),
+        sa.CheckConstraint("status IN ('Pending', 'Approved', 'Rejected')", name='receipts_status_check'),
+    )
+
+    op.create_table(
+        'receipt_audit',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('receipt_id', sa.Integer(), sa.ForeignKey('receipts.id', ondelete='CASCADE')),
+        sa.Column('supervisor_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='SET NULL')),
+        sa.Column('action', sa.String(20), nullable=False),
+        sa.Column('action_timestamp', sa.DateTime(), server_default=sa.func.current_timestamp()),
+        sa.Column('comments', sa.Text()),
+        sa.CheckConstraint("action IN ('Approved', 'Rejected')", name='receipt_audit_action_check'),
+    )
+
+
+def downgrade():
+    # Created by db.create_all() before migrations, or by 0002 when missing
+    op.drop_table('ocr_jobs', if_exists=True)
+    op.drop_table('receipt_items', if_exists=True)
+    op.drop_table('receipt_audit')
+    op.drop_table('receipts')
+    op.drop_table('users')
+    op.drop_table('user_roles')
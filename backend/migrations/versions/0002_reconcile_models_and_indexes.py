@@ -0,0 +1,92 @@
+"""Reconcile the schema with the models and index the hot query paths
+
+- receipt_items and ocr_jobs were only ever created by db.create_all(), so they
+  are created here when missing; downgrading leaves them in place, as the app had
+  them before migrations (0001's downgrade drops them)
+- receipts.amount becomes NUMERIC(10, 2) everywhere (create_all made it a float)
+- columns the models have always treated as required become NOT NULL
+- indexes for employee history, supervisor listings, the pending approval
+  queue, item and audit lookups by receipt, and queued OCR jobs
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 09:30:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    tables = sa.inspect(bind).get_table_names()
+
+    if 'receipt_items' not in tables:
+        op.create_table(
+            'receipt_items',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('receipt_id', sa.Integer(), sa.ForeignKey('receipts.id', ondelete='CASCADE'), nullable=False),
+            sa.Column('item_name', sa.String(255), nullable=False),
+            sa.Column('amount', sa.Numeric(10, 2), nullable=False),
+        )
+
+    if 'ocr_jobs' not in tables:
+        op.create_table(
+            'ocr_jobs',
+            sa.Column('id', sa.String(32), primary_key=True),
+            sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+            sa.Column('file_path', sa.String(255), nullable=False),
+            sa.Column('image_hash', sa.String(64)),
+            sa.Column('status', sa.String(20), nullable=False),
+            sa.Column('result', sa.Text()),
+            sa.Column('error', sa.Text()),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.Column('finished_at', sa.DateTime()),
+        )
+
+    if bind.dialect.name == 'postgresql':
+        op.alter_column('receipts', 'amount', type_=sa.Numeric(10, 2), postgresql_using='amount::numeric(10, 2)')
+
+    op.execute("UPDATE receipts SET category = 'Unknown' WHERE category IS NULL")
+    op.execute("UPDATE receipts SET status = 'Pending' WHERE status IS NULL")
+    op.execute("UPDATE receipts SET uploaded_at = CURRENT_TIMESTAMP WHERE uploaded_at IS NULL")
+    op.execute("UPDATE receipt_audit SET action_timestamp = CURRENT_TIMESTAMP WHERE action_timestamp IS NULL")
+    with op.batch_alter_table('receipts') as batch:
+        for column, type_ in (('user_id', sa.Integer()), ('category', sa.String(50)),
+                              ('status', sa.String(20)), ('uploaded_at', sa.DateTime())):
+            batch.alter_column(column, existing_type=type_, nullable=False)
+    with op.batch_alter_table('receipt_audit') as batch:
+        batch.alter_column('receipt_id', existing_type=sa.Integer(), nullable=False)
+        batch.alter_column('action_timestamp', existing_type=sa.DateTime(), nullable=False)
+
+    op.create_index('ix_receipts_user_id_uploaded_at', 'receipts', ['user_id', sa.text('uploaded_at DESC')],
+                    if_not_exists=True)
+    op.create_index('ix_receipts_uploaded_at_id', 'receipts', [sa.text('uploaded_at DESC'), sa.text('id DESC')],
+                    if_not_exists=True)
+    op.create_index('ix_receipts_pending', 'receipts', ['status'], if_not_exists=True,
+                    postgresql_where=sa.text("status = 'Pending'"), sqlite_where=sa.text("status = 'Pending'"))
+    op.create_index('ix_receipt_items_receipt_id', 'receipt_items', ['receipt_id'], if_not_exists=True)
+    op.create_index('ix_receipt_audit_receipt_id', 'receipt_audit', ['receipt_id'], if_not_exists=True)
+    op.create_index('ix_ocr_jobs_status', 'ocr_jobs', ['status'], if_not_exists=True)
+
+
+def downgrade():
+    with op.batch_alter_table('receipt_audit') as batch:
+        batch.alter_column('receipt_id', existing_type=sa.Integer(), nullable=True)
+        batch.alter_column('action_timestamp', existing_type=sa.DateTime(), nullable=True)
+    with op.batch_alter_table('receipts') as batch:
+        for column, type_ in (('user_id', sa.Integer()), ('category', sa.String(50)),
+                              ('status', sa.String(20)), ('uploaded_at', sa.DateTime())):
+            batch.alter_column(column, existing_type=type_, nullable=True)
+    op.drop_index('ix_receipt_audit_receipt_id', table_name='receipt_audit')
+    op.drop_index('ix_receipt_items_receipt_id', table_name='receipt_items')
+    op.drop_index('ix_receipts_pending', table_name='receipts')
+    op.drop_index('ix_receipts_uploaded_at_id', table_name='receipts')
+    op.drop_index('ix_receipts_user_id_uploaded_at', table_name='receipts')
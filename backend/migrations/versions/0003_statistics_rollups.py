@@ -0,0 +1,49 @@
+"""Statistics rollups: receipt totals per user, day, category, store and status
+
+The table is backfilled from receipts here; afterwards the write endpoints keep
+it in step. `flask --app backend verify-rollups` checks it against receipts and
+`flask --app backend rebuild-rollups` recomputes it.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 11:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'receipt_rollups',
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('category', sa.String(50), nullable=False),
+        sa.Column('store', sa.String(50), nullable=False),
+        sa.Column('status', sa.String(20), nullable=False),
+        sa.Column('receipt_count', sa.Integer(), nullable=False),
+        sa.Column('nonzero_count', sa.Integer(), nullable=False),
+        sa.Column('amount_total', sa.Numeric(14, 2), nullable=False),
+        sa.PrimaryKeyConstraint('user_id', 'day', 'category', 'store', 'status'),
+    )
+    op.create_index('ix_receipt_rollups_day', 'receipt_rollups', ['day'])
+
+    op.execute("""
+        INSERT INTO receipt_rollups (user_id, day, category, store, status, receipt_count, nonzero_count, amount_total)
+        SELECT user_id, date(uploaded_at), category, COALESCE(NULLIF(store_name, ''), 'Unknown Store'), lower(status),
+               count(*), SUM(CASE WHEN amount <> 0 THEN 1 ELSE 0 END), COALESCE(SUM(amount), 0)
+        FROM receipts
+        GROUP BY user_id, date(uploaded_at), category, COALESCE(NULLIF(store_name, ''), 'Unknown Store'), lower(status)
+    """)
+
+
+def downgrade():
+    op.drop_index('ix_receipt_rollups_day', table_name='receipt_rollups')
+    op.drop_table('receipt_rollups')
@@ -0,0 +1,42 @@
+"""Background report jobs
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 12:30:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'report_jobs',
+        sa.Column('id', sa.String(32), primary_key=True),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('scope', sa.String(20), nullable=False),
+        sa.Column('target_user_id', sa.Integer()),
+        sa.Column('start_date', sa.Date()),
+        sa.Column('end_date', sa.Date()),
+        sa.Column('format', sa.String(10), nullable=False),
+        sa.Column('cache_key', sa.String(64), nullable=False),
+        sa.Column('status', sa.String(20), nullable=False),
+        sa.Column('error', sa.Text()),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('finished_at', sa.DateTime()),
+    )
+    op.create_index('ix_report_jobs_cache_key', 'report_jobs', ['cache_key'])
+    op.create_index('ix_report_jobs_status', 'report_jobs', ['status'])
+
+
+def downgrade():
+    op.drop_index('ix_report_jobs_status', table_name='report_jobs')
+    op.drop_index('ix_report_jobs_cache_key', table_name='report_jobs')
+    op.drop_table('report_jobs')
@@ -0,0 +1,105 @@
+"""Partition receipt_audit by month and index it for keyset pagination
+
+On PostgreSQL receipt_audit is rebuilt as a table range-partitioned on
+action_timestamp: one receipt_audit_yYYYYmMM partition per month from the oldest
+row to three months ahead, plus receipt_audit_default as a catch-all. The
+primary key becomes (id, action_timestamp) because a partitioned table's keys
+must include the partition column; the id sequence is kept. Later months are
+added by `flask --app backend ensure-audit-partitions` (also run at startup) and
+old ones detached by `flask --app backend archive-audit-logs`.
+
+Other databases only get the new indexes.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 14:00:00
+
+"""
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+MONTHS_AHEAD = 3
+
+
+def add_months(month, count):
+    years, month_index = divmod(month.month - 1 + count, 12)
+    return date(month.year + years, month_index + 1, 1)
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        op.create_index('ix_receipt_audit_action_timestamp_id', 'receipt_audit',
+                        [sa.text('action_timestamp DESC'), sa.text('id DESC')])
+        op.create_index('ix_receipt_audit_supervisor_id', 'receipt_audit', ['supervisor_id'])
+        return
+
+    op.execute("ALTER TABLE receipt_audit RENAME TO receipt_audit_unpartitioned")
+    op.execute("ALTER TABLE receipt_audit_unpartitioned RENAME CONSTRAINT receipt_audit_pkey TO receipt_audit_unpartitioned_pkey")
+    op.execute("DROP INDEX IF EXISTS ix_receipt_audit_receipt_id")
+    op.execute("""
+        CREATE TABLE receipt_audit (
+            id INTEGER NOT NULL DEFAULT nextval('receipt_audit_id_seq'),
+            receipt_id INTEGER NOT NULL REFERENCES receipts(id) ON DELETE CASCADE,
+            supervisor_id INTEGER REFERENCES users(id) ON DELETE SET NULL,
+            action VARCHAR(20) NOT NULL CONSTRAINT receipt_audit_action_check CHECK (action IN ('Approved', 'Rejected')),
+            action_timestamp TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            comments TEXT,
+            PRIMARY KEY (id, action_timestamp)
+        ) PARTITION BY RANGE (action_timestamp)
+    """)
+    # Hand the sequence to the new table so dropping the old one keeps it
+    op.execute("ALTER SEQUENCE receipt_audit_id_seq OWNED BY receipt_audit.id")
+    op.execute("CREATE INDEX ix_receipt_audit_receipt_id ON receipt_audit (receipt_id)")
+    op.execute("CREATE INDEX ix_receipt_audit_action_timestamp_id ON receipt_audit (action_timestamp DESC, id DESC)")
+    op.execute("CREATE INDEX ix_receipt_audit_supervisor_id ON receipt_audit (supervisor_id)")
+    op.execute("CREATE TABLE receipt_audit_default PARTITION OF receipt_audit DEFAULT")
+
+    oldest = bind.execute(sa.text("SELECT min(action_timestamp) FROM receipt_audit_unpartitioned")).scalar()
+    month = (oldest.date() if oldest else date.today()).replace(day=1)
+    last = add_months(date.today().replace(day=1), MONTHS_AHEAD)
+    while month <= last:
+        upper = add_months(month, 1)
+        op.execute(f"CREATE TABLE receipt_audit_y{month:%Y}m{month:%m} PARTITION OF receipt_audit "
+                   f"FOR VALUES FROM ('{month}') TO ('{upper}')")
+        month = upper
+
+    op.execute("INSERT INTO receipt_audit SELECT id, receipt_id, supervisor_id, action, action_timestamp, comments "
+               "FROM receipt_audit_unpartitioned")
+    op.execute("DROP TABLE receipt_audit_unpartitioned")
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        op.drop_index('ix_receipt_audit_supervisor_id', table_name='receipt_audit')
+        op.drop_index('ix_receipt_audit_action_timestamp_id', table_name='receipt_audit')
+        return
+
+    op.execute("ALTER TABLE receipt_audit RENAME TO receipt_audit_partitioned")
+    op.execute("ALTER TABLE receipt_audit_partitioned RENAME CONSTRAINT receipt_audit_pkey TO receipt_audit_partitioned_pkey")
+    op.execute("ALTER INDEX ix_receipt_audit_receipt_id RENAME TO ix_receipt_audit_partitioned_receipt_id")
+    op.execute("""
+        CREATE TABLE receipt_audit (
+            id INTEGER PRIMARY KEY DEFAULT nextval('receipt_audit_id_seq'),
+            receipt_id INTEGER NOT NULL REFERENCES receipts(id) ON DELETE CASCADE,
+            supervisor_id INTEGER REFERENCES users(id) ON DELETE SET NULL,
+            action VARCHAR(20) NOT NULL CONSTRAINT receipt_audit_action_check CHECK (action IN ('Approved', 'Rejected')),
+            action_timestamp TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            comments TEXT
+        )
+    """)
+    op.execute("ALTER SEQUENCE receipt_audit_id_seq OWNED BY receipt_audit.id")
+    op.execute("INSERT INTO receipt_audit SELECT id, receipt_id, supervisor_id, action, action_timestamp, comments "
+               "FROM receipt_audit_partitioned")
+    op.execute("DROP TABLE receipt_audit_partitioned")
+    op.execute("CREATE INDEX ix_receipt_audit_receipt_id ON receipt_audit (receipt_id)")
@@ -0,0 +1,97 @@
+"""Full-text search over receipts
+
+PostgreSQL only: receipts.search_vector is a tsvector over the store name
+(weight A), item names (B) and OCR text (C). It is kept current by triggers,
+not by the application, so it is deliberately not mapped on the Receipt model:
+
+- a BEFORE INSERT/UPDATE row trigger on receipts recomputes it when the store
+  name or OCR text changes
+- statement-level triggers on receipt_items recompute it for every receipt whose
+  items changed, once per statement, so bulk item inserts stay set-based
+
+A GIN index serves the @@ matches, and a pg_trgm GIN index serves fuzzy store
+name matching.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 15:30:00
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+ITEM_TRIGGERS = {
+    'insert': 'NEW TABLE AS changed_items',
+    'update': 'NEW TABLE AS changed_items',
+    'delete': 'OLD TABLE AS changed_items',
+}
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("ALTER TABLE receipts ADD COLUMN search_vector tsvector")
+
+    op.execute("""
+        CREATE FUNCTION receipt_search_document(store_name text, extracted_text text, receipt_id integer)
+        RETURNS tsvector AS $$
+            SELECT setweight(to_tsvector('english', coalesce($1, '')), 'A')
+                || setweight(to_tsvector('english', coalesce(
+                       (SELECT string_agg(item_name, ' ') FROM receipt_items WHERE receipt_items.receipt_id = $3), '')), 'B')
+                || setweight(to_tsvector('english', coalesce($2, '')), 'C')
+        $$ LANGUAGE sql STABLE
+    """)
+    op.execute("""
+        CREATE FUNCTION receipts_search_vector_trigger() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector := receipt_search_document(NEW.store_name, NEW.extracted_text, NEW.id);
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER receipts_search_vector BEFORE INSERT OR UPDATE OF store_name, extracted_text ON receipts
+        FOR EACH ROW EXECUTE FUNCTION receipts_search_vector_trigger()
+    """)
+    op.execute("""
+        CREATE FUNCTION receipt_items_search_vector_trigger() RETURNS trigger AS $$
+        BEGIN
+            UPDATE receipts SET search_vector = receipt_search_document(store_name, extracted_text, id)
+            WHERE id IN (SELECT DISTINCT receipt_id FROM changed_items);
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    # Transition tables allow only one event per trigger
+    for event, transition in ITEM_TRIGGERS.items():
+        op.execute(f"""
+            CREATE TRIGGER receipt_items_search_vector_{event} AFTER {event.upper()} ON receipt_items
+            REFERENCING {transition} FOR EACH STATEMENT EXECUTE FUNCTION receipt_items_search_vector_trigger()
+        """)
+
+    op.execute("UPDATE receipts SET search_vector = receipt_search_document(store_name, extracted_text, id)")
+    op.execute("CREATE INDEX ix_receipts_search_vector ON receipts USING gin (search_vector)")
+    op.execute("CREATE INDEX ix_receipts_store_name_trgm ON receipts USING gin (store_name gin_trgm_ops)")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute("DROP INDEX ix_receipts_store_name_trgm")
+    op.execute("DROP INDEX ix_receipts_search_vector")
+    for event in ITEM_TRIGGERS:
+        op.execute(f"DROP TRIGGER receipt_items_search_vector_{event} ON receipt_items")
+    op.execute("DROP FUNCTION receipt_items_search_vector_trigger()")
+    op.execute("DROP TRIGGER receipts_search_vector ON receipts")
+    op.execute("DROP FUNCTION receipts_search_vector_trigger()")
+    op.execute("DROP FUNCTION receipt_search_document(text, text, integer)")
+    op.execute("ALTER TABLE receipts DROP COLUMN search_vector")
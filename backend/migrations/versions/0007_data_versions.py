@@ -0,0 +1,29 @@
+"""Per-scope data versions for ETags on the receipt read routes
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 18:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Missing rows read as version 0, so there is nothing to backfill
+    op.create_table(
+        'data_versions',
+        sa.Column('scope', sa.String(40), primary_key=True),
+        sa.Column('version', sa.BigInteger(), nullable=False, server_default='0'),
+    )
+
+
+def downgrade():
+    op.drop_table('data_versions')
@@ -0,0 +1,27 @@
+"""Link receipts to their uploaded image
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 19:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # SHA-256 of the upload, which is also its file name under uploads/; older receipts stay NULL
+    op.add_column('receipts', sa.Column('image_hash', sa.String(64)))
+    op.create_index('ix_receipts_image_hash', 'receipts', ['image_hash'])
+
+
+def downgrade():
+    op.drop_index('ix_receipts_image_hash', table_name='receipts')
+    op.drop_column('receipts', 'image_hash')
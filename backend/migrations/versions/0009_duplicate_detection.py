@@ -0,0 +1,54 @@
+"""Near-duplicate receipt detection
+
+- receipts.phash: 64-bit perceptual hash of the uploaded image, when there was one
+- receipt_phash_blocks: the hash split into four 16-bit blocks, one row each, so a
+  Hamming-distance search is a handful of primary key lookups (multi-index hashing)
+- receipts.fingerprint: SHA-256 of the normalized store, total and items, indexed
+  with uploaded_at for same-receipt lookups within a time window
+- receipts.duplicate_of_id: the earlier receipt this one was flagged against
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 20:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('receipts') as batch:
+        batch.add_column(sa.Column('phash', sa.BigInteger()))
+        batch.add_column(sa.Column('fingerprint', sa.String(64)))
+        batch.add_column(sa.Column('duplicate_of_id', sa.Integer()))
+        batch.create_foreign_key('fk_receipts_duplicate_of_id', 'receipts', ['duplicate_of_id'], ['id'],
+                                 ondelete='SET NULL')
+    op.create_index('ix_receipts_fingerprint_uploaded_at', 'receipts', ['fingerprint', 'uploaded_at'])
+    op.create_index('ix_receipts_duplicate_of_id', 'receipts', ['duplicate_of_id'])
+
+    op.create_table(
+        'receipt_phash_blocks',
+        sa.Column('block', sa.SmallInteger(), primary_key=True),
+        sa.Column('value', sa.Integer(), primary_key=True),
+        sa.Column('receipt_id', sa.Integer(), sa.ForeignKey('receipts.id', ondelete='CASCADE'), primary_key=True),
+    )
+    op.create_index('ix_receipt_phash_blocks_receipt_id', 'receipt_phash_blocks', ['receipt_id'])
+
+
+def downgrade():
+    op.drop_index('ix_receipt_phash_blocks_receipt_id', table_name='receipt_phash_blocks')
+    op.drop_table('receipt_phash_blocks')
+    op.drop_index('ix_receipts_duplicate_of_id', table_name='receipts')
+    op.drop_index('ix_receipts_fingerprint_uploaded_at', table_name='receipts')
+    with op.batch_alter_table('receipts') as batch:
+        batch.drop_constraint('fk_receipts_duplicate_of_id', type_='foreignkey')
+        batch.drop_column('duplicate_of_id')
+        batch.drop_column('fingerprint')
+        batch.drop_column('phash')
@@ -0,0 +1,32 @@
+"""Report job leases
+
+report_jobs.updated_at changes with every status change and while a job is being built, so
+jobs whose process went away (worker recycled or killed) can be told apart and resubmitted.
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18 22:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0010'
+down_revision = '0009'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('report_jobs') as batch:
+        batch.add_column(sa.Column('updated_at', sa.DateTime()))
+    op.execute("UPDATE report_jobs SET updated_at = coalesce(finished_at, created_at)")
+    with op.batch_alter_table('report_jobs') as batch:
+        batch.alter_column('updated_at', existing_type=sa.DateTime(), nullable=False)
+
+
+def downgrade():
+    with op.batch_alter_table('report_jobs') as batch:
+        batch.drop_column('updated_at')
@@ -0,0 +1,130 @@
+# pylint: disable=no-member
+import cv2
+import numpy as np
+import os
+import time
+from ocr_engines import OCR_LANG, get_engine
+from preprocess import preprocess, config_signature
+from receipt_parser import parse_receipt_text
+
+# Identify the extraction pipeline in OCR cache keys; bump the version whenever its output changes
+OCR_CONFIG_VERSION = f"3-{OCR_LANG}-{config_signature()}"
+# PDF pages are rasterized at this resolution; pages past OCR_MAX_PDF_PAGES are ignored
+PDF_DPI = int(os.environ.get('OCR_PDF_DPI', 200))
+MAX_PDF_PAGES = int(os.environ.get('OCR_MAX_PDF_PAGES', 20))
+
+
+def is_pdf(path):
+    try:
+        with open(path, 'rb') as f:
+            return f.read(5) == b'%PDF-'
+    except OSError:
+        return False
+
+
+def open_pdf(path):
+    try:
+        import fitz
+    except ImportError as e:
+        raise RuntimeError("PDF receipts need PyMuPDF (pip install pymupdf)") from e
+    return fitz, fitz.open(path)
+
+
+def pdf_page_count(path):
+    _, document = open_pdf(path)
+    with document:
+        return min(document.page_count, MAX_PDF_PAGES)
+
+
+def rasterize_page(path, page_number, dpi=PDF_DPI):
+    """One PDF page as a BGR image, like cv2.imread would return."""
+    fitz, document = open_pdf(path)
+    with document:
+        pixmap = document.load_page(page_number).get_pixmap(dpi=dpi, colorspace=fitz.csRGB, alpha=False)
+    image = np.frombuffer(pixmap.samples, dtype=np.uint8).reshape(pixmap.height, pixmap.width, pixmap.n)
+    return cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
+
+
+def ocr_image(image, stages=None, engine=None):
+    # Grayscale, crop, downscale and deskew before Tesseract (see preprocess.py)
+    image, timings = preprocess(image, stages)
+    start = time.perf_counter()
+    text = (engine or get_engine()).image_to_string(image)
+    timings["ocr"] = (time.perf_counter() - start) * 1000
+    return text, timings
+
+
+def extract_pdf_page(path, page_number, stages=None, engine=None):
+    """Text and timings of one PDF page; parsing happens once all pages are in (merge_pages)."""
+    start = time.perf_counter()
+    image = rasterize_page(path, page_number)
+    timings = {"rasterize": (time.perf_counter() - start) * 1000}
+    text, stage_timings = ocr_image(image, stages, engine)
+    timings.update(stage_timings)
+    return {"page": page_number, "text": text, "timings": timings}
+
+
+def merge_pages(pages):
+    """Merge per-page OCR results, in page order, into one extraction."""
+    read = [page for page in pages if "error" not in page]
+    if not read:
+        return {"error": pages[0]["error"] if pages else "The PDF has no pages."}
+
+    start = time.perf_counter()
+    result = parse_receipt_text("\n".join(page["text"] for page in read))
+    if len(read) > 1:
+        # Items are parsed page by page, so a "Subtotal" line on page 1 does not cut off page 2's items
+        result["items"] = [item for page in read for item in parse_receipt_text(page["text"])["items"]]
+
+    timings = {}
+    for page in read:
+        for stage, elapsed in page["timings"].items():
+            timings[stage] = timings.get(stage, 0) + elapsed
+    result["timings"] = dict(timings, parse=(time.perf_counter() - start) * 1000)
+    result["pages"] = len(pages)
+    if len(read) < len(pages):
+        result["page_errors"] = [f"page {page['page'] + 1}: {page['error']}" for page in pages if "error" in page]
+    return result
+
+
+# OCR text extractor for images and PDFs; engine defaults to OCR_ENGINE (see ocr_engines.py)
+def extract_text(image_path, stages=None, engine=None):
+    if is_pdf(image_path):
+        # Sequential here; the upload path fans the pages out across the OCR pool instead
+        return merge_pages([extract_pdf_page(image_path, page_number, stages, engine)
+                            for page_number in range(pdf_page_count(image_path))])
+
+    start = time.perf_counter()
+    image = cv2.imread(image_path)
+    if image is None:
+        return {"error": "Could not read the image."}
+    timings = {"imread": (time.perf_counter() - start) * 1000}
+
+    text, stage_timings = ocr_image(image, stages, engine)
+    timings.update(stage_timings)
+    start = time.perf_counter()
+
+    result = parse_receipt_text(text)
+    result["timings"] = dict(timings, parse=(time.perf_counter() - start) * 1000)
+    return result
+
+# Process-pool entry points: failures come back as an error result, since some
+# exceptions (e.g. TesseractNotFoundError) cannot be pickled back to the parent
+def run_ocr(image_path):
+    try:
+        return extract_text(image_path)
+    except Exception as e:
+        return {"error": f"OCR failed: {e}"}
+
+def run_ocr_page(pdf_path, page_number):
+    try:
+        return extract_pdf_page(pdf_path, page_number)
+    except Exception as e:
+        return {"page": page_number, "error": f"OCR failed: {e}"}
+
+def run_reparse(text):
+    # Re-parse stored OCR text (reocr --reparse-only, or receipts without a stored image)
+    start = time.perf_counter()
+    result = parse_receipt_text(text)
+    result["timings"] = {"parse": (time.perf_counter() - start) * 1000}
+    return result
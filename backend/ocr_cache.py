@@ -0,0 +1,62 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+
+
+# Two-tier OCR result cache: a bounded in-memory LRU in front of one JSON file per key on disk
+class OcrCache:
+    def __init__(self, directory, max_entries=1024):
+        self.directory = directory
+        self.max_entries = max_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def make_key(image_hash, engine, config_version):
+        return f"{image_hash}-{engine}-{config_version}"
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _remember(self, key, value):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key):
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return self._memory[key]
+
+        try:
+            with open(self._path(key), encoding='utf-8') as f:
+                value = json.load(f)
+        except (OSError, ValueError):
+            with self._lock:
+                self.stats["misses"] += 1
+            return None
+
+        with self._lock:
+            self._remember(key, value)
+            self.stats["disk_hits"] += 1
+        return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._remember(key, value)
+
+        # Write-then-rename so a concurrent reader never sees a partial file
+        tmp_path = f"{self._path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(value, f)
+        os.replace(tmp_path, self._path(key))
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self.stats, memory_entries=len(self._memory), max_entries=self.max_entries)
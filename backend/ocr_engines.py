@@ -0,0 +1,81 @@
+import os
+import queue
+
+# pylint: disable=no-member
+import cv2
+
+# Engine selection; TESSERACT_CMD only matters for the pytesseract engine (e.g. on Windows:
+# C:\Program Files\Tesseract-OCR\tesseract.exe)
+OCR_ENGINE = os.environ.get('OCR_ENGINE', 'pytesseract')
+OCR_LANG = os.environ.get('OCR_LANG', 'eng')
+TESSERACT_CMD = os.environ.get('TESSERACT_CMD', 'tesseract')
+# API handles per process for the tesserocr engine; each one holds a loaded language model
+TESSEROCR_POOL_SIZE = int(os.environ.get('TESSEROCR_POOL_SIZE', 1))
+
+
+class PytesseractEngine:
+    """Runs the tesseract binary once per image (subprocess plus temp files)."""
+    name = "pytesseract"
+
+    def __init__(self, lang=OCR_LANG, tesseract_cmd=TESSERACT_CMD):
+        import pytesseract
+        pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+        self._pytesseract = pytesseract
+        self.lang = lang
+
+    def image_to_string(self, image):
+        return self._pytesseract.image_to_string(image, lang=self.lang)
+
+    def close(self):
+        pass
+
+
+class TesserocrEngine:
+    """Keeps persistent in-process Tesseract API handles and feeds them numpy buffers directly.
+
+    The language model is loaded once per handle instead of once per image, and there is no
+    subprocess or temp file. Handles are checked out of a pool, so the engine is thread-safe.
+    """
+    name = "tesserocr"
+
+    def __init__(self, lang=OCR_LANG, pool_size=TESSEROCR_POOL_SIZE):
+        try:
+            import tesserocr
+        except ImportError as e:
+            raise RuntimeError("OCR_ENGINE=tesserocr needs the tesserocr package (pip install tesserocr)") from e
+        self._handles = queue.Queue()
+        for _ in range(pool_size):
+            self._handles.put(tesserocr.PyTessBaseAPI(lang=lang))
+
+    def image_to_string(self, image):
+        if image.ndim == 3:
+            # OpenCV images are BGR; Tesseract reads 3-byte pixels as RGB
+            image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        image = image if image.flags['C_CONTIGUOUS'] else image.copy()
+        height, width = image.shape[:2]
+        bytes_per_pixel = 1 if image.ndim == 2 else image.shape[2]
+
+        api = self._handles.get()
+        try:
+            api.SetImageBytes(image.tobytes(), width, height, bytes_per_pixel, image.strides[0])
+            return api.GetUTF8Text()
+        finally:
+            self._handles.put(api)
+
+    def close(self):
+        while not self._handles.empty():
+            self._handles.get_nowait().End()
+
+
+ENGINES = {engine.name: engine for engine in (PytesseractEngine, TesserocrEngine)}
+
+_engines = {}
+
+
+def get_engine(name=OCR_ENGINE):
+    """The process-wide instance of an engine, created on first use (so once per OCR worker)."""
+    if name not in _engines:
+        if name not in ENGINES:
+            raise ValueError(f"Unknown OCR engine {name!r}; choose from {', '.join(ENGINES)}")
+        _engines[name] = ENGINES[name]()
+    return _engines[name]
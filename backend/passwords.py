@@ -0,0 +1,75 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the hashing queue stays full for longer than the hasher's queue_timeout."""
+
+
+# bcrypt on a small thread pool: bcrypt releases the GIL, so request threads wait on a future
+# instead of burning their own CPU, and at most max_pending hashes are ever queued or running.
+class PasswordHasher:
+    def __init__(self, rounds=12, workers=2, max_pending=8, queue_timeout=2.0):
+        self.rounds = rounds
+        self.workers = workers
+        self.queue_timeout = queue_timeout
+        self._slots = threading.BoundedSemaphore(max(max_pending, workers))
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+    def _get_pool(self):
+        # Created on first use, so each gunicorn worker builds its own after the fork
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='bcrypt')
+            return self._pool
+
+    def _submit(self, fn, *args):
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            raise PasswordHasherBusy()
+        try:
+            future = self._get_pool().submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def _hash(self, password):
+        return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(self.rounds)).decode('utf-8')
+
+    @staticmethod
+    def _verify(password, password_hash):
+        try:
+            return bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8'))
+        except ValueError:  # not a bcrypt hash
+            return False
+
+    def hash(self, password):
+        return self._submit(self._hash, password).result()
+
+    def verify(self, password, password_hash):
+        return self._submit(self._verify, password, password_hash).result()
+
+    def hash_many(self, passwords):
+        """Hash in parallel, keeping at most `workers` of these in flight so logins still get slots."""
+        passwords = list(passwords)
+        hashes = [None] * len(passwords)
+        in_flight = []
+        for index, password in enumerate(passwords):
+            if len(in_flight) >= self.workers:
+                done_index, future = in_flight.pop(0)
+                hashes[done_index] = future.result()
+            in_flight.append((index, self._submit(self._hash, password)))
+        for done_index, future in in_flight:
+            hashes[done_index] = future.result()
+        return hashes
+
+    def needs_rehash(self, password_hash):
+        # $2b$<cost>$<salt+digest>
+        try:
+            return int(password_hash.split('$')[2]) != self.rounds
+        except (IndexError, ValueError):
+            return True
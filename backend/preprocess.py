@@ -0,0 +1,100 @@
+import os
+import time
+# pylint: disable=no-member
+import cv2
+
+# Receipt widths are ~80mm (3.15in); 300 DPI is what Tesseract is tuned for
+RECEIPT_WIDTH_INCHES = 3.15
+TARGET_DPI = int(os.environ.get('OCR_TARGET_DPI', 300))
+
+# Comma-separated stage names, applied in order; "none" disables preprocessing. Crop runs before
+# downscale so the receipt itself, not the whole photo, is brought to RECEIPT_WIDTH_INCHES at TARGET_DPI.
+DEFAULT_STAGES = "grayscale,crop,downscale,deskew"
+PREPROCESS_STAGES = [
+    stage.strip() for stage in os.environ.get('OCR_PREPROCESS', DEFAULT_STAGES).split(',')
+    if stage.strip() and stage.strip() != 'none'
+]
+
+
+def to_grayscale(image):
+    if image.ndim == 3:
+        return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    return image
+
+
+def downscale(image, dpi=TARGET_DPI):
+    # Only ever shrink: upscaling low-resolution photos adds no detail for Tesseract
+    max_width = int(RECEIPT_WIDTH_INCHES * dpi)
+    height, width = image.shape[:2]
+    if width <= max_width:
+        return image
+    scale = max_width / width
+    return cv2.resize(image, (max_width, int(height * scale)), interpolation=cv2.INTER_AREA)
+
+
+def adaptive_threshold(image):
+    return cv2.adaptiveThreshold(to_grayscale(image), 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+                                 cv2.THRESH_BINARY, 31, 15)
+
+
+def deskew(image):
+    gray = to_grayscale(image)
+    # Ink becomes foreground; the minimum-area rectangle around it gives the text angle
+    _, ink = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)
+    points = cv2.findNonZero(ink)
+    if points is None:
+        return image
+
+    angle = cv2.minAreaRect(points)[-1]
+    if angle > 45:
+        angle -= 90
+    elif angle < -45:
+        angle += 90
+    if abs(angle) < 0.5:
+        return image
+
+    height, width = image.shape[:2]
+    matrix = cv2.getRotationMatrix2D((width / 2, height / 2), angle, 1.0)
+    return cv2.warpAffine(image, matrix, (width, height), flags=cv2.INTER_CUBIC,
+                          borderMode=cv2.BORDER_REPLICATE)
+
+
+def crop_to_receipt(image, min_area_ratio=0.2):
+    # Crop to the largest bright contour (the paper) when it covers a sensible share of the photo
+    gray = to_grayscale(image)
+    blurred = cv2.GaussianBlur(gray, (5, 5), 0)
+    _, paper = cv2.threshold(blurred, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+    contours, _ = cv2.findContours(paper, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    if not contours:
+        return image
+
+    x, y, w, h = cv2.boundingRect(max(contours, key=cv2.contourArea))
+    height, width = gray.shape[:2]
+    if w * h < min_area_ratio * width * height or (w == width and h == height):
+        return image
+    return image[y:y + h, x:x + w]
+
+
+STAGES = {
+    "grayscale": to_grayscale,
+    "downscale": downscale,
+    "threshold": adaptive_threshold,
+    "deskew": deskew,
+    "crop": crop_to_receipt,
+}
+
+
+def preprocess(image, stages=None):
+    """Run the configured stages over a cv2 image; returns (image, {stage: milliseconds})."""
+    timings = {}
+    for stage in PREPROCESS_STAGES if stages is None else stages:
+        start = time.perf_counter()
+        image = STAGES[stage](image)
+        timings[stage] = (time.perf_counter() - start) * 1000
+    return image, timings
+
+
+def config_signature(stages=None):
+    # Part of the OCR cache key: different preprocessing means different OCR output
+    stages = PREPROCESS_STAGES if stages is None else stages
+    return "+".join(stages or ["none"]) + f"@{TARGET_DPI}"
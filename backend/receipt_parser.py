@@ -0,0 +1,83 @@
+import re
+
+# Category keywords in priority order: the first category with any keyword in the text wins
+CATEGORY_KEYWORDS = [
+    ("Groceries", ["walmart", "target", "publix", "grocery", "supermarket", "aldi", "costco"]),
+    ("Flight", ["airlines", "flight", "delta", "american airlines", "united airlines", "airport"]),
+    ("Transportation", ["uber", "lyft", "taxi", "transport", "bus", "train", "subway"]),
+    ("Materials/Tools", ["home depot", "lowe's", "hardware", "tools", "material", "construction"]),
+    ("Lodging", ["hotel", "motel", "inn", "resort", "bnb"]),
+    ("Meals", ["restaurant", "dining", "food", "pizza", "burger", "cafe", "steakhouse"]),
+]
+
+# Item lines stop at the first line mentioning any of these
+STOP_WORDS = ["order total", "sales tax", "grand total", "change", "amount", "balance", "payment", "cash",
+              "subtotal", "savings summary", "special price savings"]
+
+AMOUNT_RE = re.compile(r"\$\s?(\d+\.\d{2})")
+DATE_RE = re.compile(r"(\d{2}/\d{2}/\d{4})")
+PROMOTION_RE = re.compile(r"promotion\s+\-?\$?\s*(\d+\.\d{2})")
+ITEM_RE = re.compile(r"(.+?)\s+\$?\s*(\d+\.\d{2})")
+STOP_RE = re.compile("|".join(re.escape(word) for word in STOP_WORDS))
+
+
+def detect_category(text_lower):
+    # Plain substring scans over the lowered text: for ~40 short keywords CPython's C-level
+    # `in` measured faster than one combined regex alternation
+    for category, keywords in CATEGORY_KEYWORDS:
+        for keyword in keywords:
+            if keyword in text_lower:
+                return category
+    return "Other"
+
+
+def parse_receipt_text(text):
+    """Extract total, store, date, category and items from OCR text in a single pass over its lines."""
+    # Extract total amount
+    amount_match = AMOUNT_RE.search(text)
+    total_amount = float(amount_match.group(1)) if amount_match else None
+
+    # Extract receipt date
+    date_match = DATE_RE.search(text)
+    receipt_date = date_match.group(1) if date_match else None
+
+    text_lower = text.lower()
+    lines = text.split('\n')
+
+    # Extract store name (first line)
+    store_name = lines[0].strip() if text else 'Unknown'
+
+    # One scan for the first stop word; only the lines above it can hold items.
+    # Stop words never span a newline, and lowering never adds or removes one.
+    stop = STOP_RE.search(text_lower)
+    if stop:
+        lines = lines[:text_lower.count('\n', 0, stop.start())]
+
+    # Extract items and promotions
+    items = []
+    last_item_name = None
+
+    for raw_line in lines:
+        line = raw_line.strip()
+        line_lower = line.lower()
+
+        if "promotion" in line_lower:
+            match = PROMOTION_RE.search(line_lower)
+            if match and last_item_name:
+                items.append((f"Promotion for {last_item_name}", -abs(float(match.group(1)))))
+            continue
+
+        match = ITEM_RE.search(line)
+        if match:
+            item_name = match.group(1).strip()
+            items.append((item_name, float(match.group(2))))
+            last_item_name = item_name
+
+    return {
+        "raw_text": text,
+        "amount": total_amount,
+        "store_name": store_name,
+        "receipt_date": receipt_date,
+        "category": detect_category(text_lower),
+        "items": items
+    }
@@ -0,0 +1,141 @@
+import csv
+import hashlib
+import io
+import os
+import threading
+from decimal import Decimal
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+from reportlab.platypus import Table, TableStyle
+
+REPORT_FORMATS = {"csv": "text/csv", "pdf": "application/pdf"}
+REPORT_COLUMNS = ["Receipt", "Date", "Submitted by", "Store", "Category", "Status", "Amount"]
+CSV_CHUNK_ROWS = 1000
+PDF_ROWS_PER_PAGE = 38
+PDF_MARGIN = 36
+PDF_COLUMN_WIDTHS = [45, 70, 95, 110, 85, 60, 60]
+PDF_COLUMN_CHARS = [8, 12, 20, 24, 18, 10, 12]
+PDF_STYLE = TableStyle([
+    ('FONT', (0, 0), (-1, -1), 'Helvetica', 8),
+    ('FONT', (0, 0), (-1, 0), 'Helvetica-Bold', 8),
+    ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+    ('GRID', (0, 0), (-1, -1), 0.25, colors.grey),
+    ('ALIGN', (-1, 0), (-1, -1), 'RIGHT'),
+    ('TOPPADDING', (0, 0), (-1, -1), 2),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
+])
+
+
+def format_row(row):
+    """(id, uploaded_at, user name, store, category, status, amount) -> report cells."""
+    receipt_id, uploaded_at, user_name, store_name, category, status, amount = row
+    return [str(receipt_id), uploaded_at.strftime('%Y-%m-%d'), user_name, store_name or "Unknown Store",
+            category, status, f"{amount or 0:.2f}"]
+
+
+def iter_csv(rows, chunk_rows=CSV_CHUNK_ROWS):
+    """Yield the CSV report as text chunks of up to chunk_rows rows."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(REPORT_COLUMNS)
+    for count, row in enumerate(rows, 1):
+        writer.writerow(format_row(row))
+        if count % chunk_rows == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def write_pdf(rows, path, title, rows_per_page=PDF_ROWS_PER_PAGE):
+    """Render the PDF report to path one page at a time.
+
+    Only the current page's rows and Table are alive in Python; finished pages are
+    compressed into the canvas, so memory no longer grows with one flowable per row.
+    """
+    pdf = canvas.Canvas(path, pagesize=letter, pageCompression=1)
+    pdf.setTitle(title)
+    width, height = letter
+    state = {"page": 0, "count": 0, "total": Decimal(0)}
+
+    def draw_page(cells, last):
+        state["page"] += 1
+        top = height - PDF_MARGIN
+        pdf.setFont('Helvetica-Bold', 12)
+        pdf.drawString(PDF_MARGIN, top, title)
+        pdf.setFont('Helvetica', 8)
+        pdf.drawRightString(width - PDF_MARGIN, top, f"Page {state['page']}")
+
+        table = Table([REPORT_COLUMNS] + cells, colWidths=PDF_COLUMN_WIDTHS)
+        table.setStyle(PDF_STYLE)
+        _, table_height = table.wrapOn(pdf, width - 2 * PDF_MARGIN, height)
+        table.drawOn(pdf, PDF_MARGIN, top - 12 - table_height)
+
+        if last:
+            # ✅ Rejected receipts are listed but left out of the total, as in /statistics
+            pdf.setFont('Helvetica-Bold', 9)
+            pdf.drawString(PDF_MARGIN, top - 28 - table_height,
+                           f"{state['count']} receipts, total excluding rejected: ${state['total']:.2f}")
+        pdf.showPage()
+
+    page = []
+    for row in rows:
+        state["count"] += 1
+        if row[5].lower() != 'rejected':
+            state["total"] += Decimal(row[6] or 0)
+        page.append([cell[:chars] for cell, chars in zip(format_row(row), PDF_COLUMN_CHARS)])
+        if len(page) == rows_per_page:
+            draw_page(page, last=False)
+            page = []
+    draw_page(page, last=True)
+    pdf.save()
+
+
+# Finished reports on disk, one file per (scope, period, data version, format), newest kept
+class ReportCache:
+    def __init__(self, directory, max_entries=200):
+        # Absolute, because send_file resolves relative paths against the app root
+        self.directory = os.path.abspath(directory)
+        self.max_entries = max_entries
+        os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def make_key(scope, period, data_version):
+        return hashlib.sha256(f"{scope}|{period}|{data_version}".encode('utf-8')).hexdigest()
+
+    def _path(self, key, fmt):
+        return os.path.join(self.directory, f"{key}.{fmt}")
+
+    def get(self, key, fmt):
+        path = self._path(key, fmt)
+        try:
+            os.utime(path)  # mark as recently used for pruning
+        except OSError:
+            return None
+        return path
+
+    def temp_path(self, key, fmt):
+        return f"{self._path(key, fmt)}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+    def publish(self, temp_path, key, fmt):
+        # Write-then-rename so a concurrent download never sees a partial file
+        os.replace(temp_path, self._path(key, fmt))
+        self.prune()
+        return self._path(key, fmt)
+
+    @staticmethod
+    def discard(temp_path):
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+
+    def prune(self):
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and not entry.name.endswith('.tmp'):
+                entries.append((entry.stat().st_mtime, entry.path))
+        for _, path in sorted(entries, reverse=True)[self.max_entries:]:
+            self.discard(path)
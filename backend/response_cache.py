@@ -0,0 +1,43 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+
+# Serialized read responses, newest kept; keys embed the data version, so a write never has to
+# find and evict anything: entries for old versions just stop being asked for and age out
+class ResponseCache:
+    def __init__(self, max_entries=256, max_entry_bytes=1024 * 1024):
+        self.max_entries = max_entries
+        self.max_entry_bytes = max_entry_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0}
+
+    @staticmethod
+    def make_key(*parts):
+        return hashlib.sha256(json.dumps(parts, default=str).encode('utf-8')).hexdigest()[:32]
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return entry
+
+    def put(self, key, body, mimetype):
+        # Very large pages are cheaper to rebuild than to pin in every worker's memory
+        if len(body) > self.max_entry_bytes:
+            return
+        with self._lock:
+            self._entries[key] = (body, mimetype)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self.stats, entries=len(self._entries), max_entries=self.max_entries)
@@ -0,0 +1,114 @@
+"""Fixtures for the backend tests: python -m pytest tests (from backend/).
+
+Every test gets a fresh, migrated SQLite database. Set TEST_DATABASE_URL to run against a
+scratch PostgreSQL database instead (it is migrated up and back down around each test); the
+PostgreSQL-only tests are skipped otherwise.
+"""
+import os
+import sys
+import tempfile
+
+import pytest
+
+# backend.py creates its upload and report folders relative to the working directory on import
+os.chdir(tempfile.mkdtemp(prefix='eeris-tests-'))
+os.environ.setdefault('BCRYPT_ROUNDS', '4')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import backend  # noqa: E402
+from config import engine_options  # noqa: E402
+from flask_jwt_extended import create_access_token  # noqa: E402
+from flask_migrate import downgrade  # noqa: E402
+from reports import ReportCache  # noqa: E402
+from response_cache import ResponseCache  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+# Seeded by migration 0001
+ROLE_IDS = {"employee": 1, "supervisor": 2, "admin": 3}
+postgresql_only = pytest.mark.skipif(not os.environ.get('TEST_DATABASE_URL', '').startswith('postgresql'),
+                                     reason="needs PostgreSQL (set TEST_DATABASE_URL)")
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    database_url = os.environ.get('TEST_DATABASE_URL', f"sqlite:///{tmp_path / 'test.db'}")
+    app = backend.create_app({
+        'SQLALCHEMY_DATABASE_URI': database_url,
+        'SQLALCHEMY_ENGINE_OPTIONS': engine_options(database_url),
+        'JWT_SECRET_KEY': 'test-secret',
+        'TESTING': True,
+    })
+    # Module-level caches outlive the app; a fresh database starts its data versions over
+    monkeypatch.setattr(backend, 'response_cache', ResponseCache())
+    monkeypatch.setattr(backend, 'report_cache', ReportCache(str(tmp_path / 'reports')))
+    backend.invalidate_role_cache()
+    with app.app_context():
+        backend.upgrade_database()
+        yield app
+        backend.db.session.remove()
+        if backend.db.engine.dialect.name != 'sqlite':
+            downgrade(revision='base')
+        backend.db.engine.dispose()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def users(app):
+    """One user per role: {"employee": User, "supervisor": User, "admin": User}."""
+    created = {
+        role: backend.User(name=role.title(), email=f"{role}@example.com", password_hash="!", role_id=role_id)
+        for role, role_id in ROLE_IDS.items()
+    }
+    backend.db.session.add_all(created.values())
+    backend.db.session.commit()
+    return created
+
+
+def auth_headers(user, role=None):
+    role = role or next(name for name, role_id in ROLE_IDS.items() if role_id == user.role_id)
+    token = create_access_token(identity=str(user.id), additional_claims={"role": role})
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def headers(users):
+    return {role: auth_headers(user) for role, user in users.items()}
+
+
+@pytest.fixture
+def query_counter(app):
+    """count() returns the SQL statements executed since the last reset()."""
+    class QueryCounter:
+        def __init__(self):
+            self.statements = 0
+
+        def __call__(self, *args):
+            self.statements += 1
+
+        def reset(self):
+            self.statements = 0
+
+        def count(self):
+            return self.statements
+
+    counter = QueryCounter()
+    event.listen(backend.db.engine, 'before_cursor_execute', counter)
+    yield counter
+    event.remove(backend.db.engine, 'before_cursor_execute', counter)
+
+
+def add_receipt(user, store="Store", category="Food", amount=10, status="Pending", items=(), **fields):
+    """Insert a receipt with its items, rollups and data versions, as the upload routes do."""
+    receipt = backend.Receipt(user_id=user.id, store_name=store, category=category, amount=amount,
+                              status=status, **fields)
+    receipt.items = [backend.ReceiptItem(item_name=name, amount=item_amount) for name, item_amount in items]
+    backend.db.session.add(receipt)
+    backend.db.session.flush()
+    backend.apply_rollup_deltas(backend.rollup_deltas([receipt]))
+    backend.bump_data_versions({user.id})
+    backend.db.session.commit()
+    return receipt
@@ -0,0 +1,105 @@
+from datetime import datetime, timedelta
+
+from flask_migrate import downgrade
+from sqlalchemy import text
+
+import backend
+from conftest import add_receipt, postgresql_only
+
+
+def add_audit_rows(receipt, supervisor, timestamps):
+    rows = [backend.ReceiptAudit(receipt_id=receipt.id, supervisor_id=supervisor.id, action='Approved',
+                                 action_timestamp=timestamp) for timestamp in timestamps]
+    backend.db.session.add_all(rows)
+    backend.db.session.commit()
+    return rows
+
+
+def read_all_pages(client, headers, **args):
+    logs, cursor, pages = [], None, 0
+    while True:
+        query = dict(args, limit=2, **({"cursor": cursor} if cursor else {}))
+        response = client.get('/audit-logs', headers=headers, query_string=query)
+        assert response.status_code == 200, response.json
+        logs += response.json["audit_logs"]
+        pages += 1
+        cursor = response.json["next_cursor"]
+        if not cursor:
+            return logs, pages
+
+
+def test_cursor_pages_cover_every_row_once(client, users, headers):
+    receipt = add_receipt(users["employee"])
+    now = datetime.utcnow().replace(microsecond=0)
+    # Ties on the timestamp are broken by id
+    rows = add_audit_rows(receipt, users["supervisor"], [now, now, now, now - timedelta(days=1), now - timedelta(days=40)])
+
+    logs, pages = read_all_pages(client, headers["supervisor"])
+    assert pages == 3
+    assert [log["id"] for log in logs] == [row.id for row in sorted(
+        rows, key=lambda row: (row.action_timestamp, row.id), reverse=True)]
+
+    assert client.get('/audit-logs', headers=headers["supervisor"], query_string={"cursor": "nope"}).status_code == 400
+    assert client.get('/audit-logs', headers=headers["employee"]).status_code == 403
+
+
+@postgresql_only
+def test_audit_rows_land_in_monthly_partitions(app, client, users, headers):
+    this_month = datetime.utcnow().replace(day=1, hour=12, minute=0, second=0, microsecond=0)
+    months = [backend.add_months(this_month.date(), offset) for offset in (-2, 0, 1, 5)]
+    # The migration partitioned the months it saw rows for through three ahead
+    partitions = backend.audit_partitions()
+    assert {backend.add_months(this_month.date(), offset) for offset in range(4)} <= set(partitions)
+
+    receipt = add_receipt(users["employee"])
+    add_audit_rows(receipt, users["supervisor"], [datetime.combine(month, this_month.time()) for month in months])
+
+    def partition_counts():
+        return dict(backend.db.session.execute(text(
+            "SELECT tableoid::regclass::text, count(*) FROM receipt_audit GROUP BY 1")).all())
+
+    # Months without a partition wait in the default one until ensure_audit_partitions covers them
+    counts = partition_counts()
+    assert counts["receipt_audit_default"] == 2
+    assert counts[partitions[months[1]]] == counts[partitions[months[2]]] == 1
+
+    created = backend.ensure_audit_partitions(months_ahead=6)
+    assert created == [f"receipt_audit_y{month:%Y}m{month:%m}" for month in
+                       (backend.add_months(this_month.date(), offset) for offset in (4, 5, 6))]
+    counts = partition_counts()
+    assert counts.get("receipt_audit_default", 0) == 1  # two months back stays in the default partition
+    assert counts[f"receipt_audit_y{months[3]:%Y}m{months[3]:%m}"] == 1
+    assert backend.ensure_audit_partitions(months_ahead=6) == []
+    backend.db.session.rollback()
+
+    logs, _ = read_all_pages(client, headers["admin"])
+    assert [log["action_timestamp"][:7] for log in logs] == [f"{month:%Y-%m}" for month in reversed(months)]
+    logs, _ = read_all_pages(client, headers["admin"], start_date=f"{months[1]}",
+                             end_date=f"{months[2] - timedelta(days=1)}")
+    assert len(logs) == 1 and logs[0]["action_timestamp"].startswith(f"{months[1]:%Y-%m}")
+
+
+@postgresql_only
+def test_partitioning_migration_keeps_existing_rows(app, users):
+    receipt_id, supervisor_id = add_receipt(users["employee"]).id, users["supervisor"].id
+    backend.db.session.remove()
+    downgrade(revision='0004')
+
+    this_month = datetime.utcnow().date().replace(day=1)
+    oldest = backend.add_months(this_month, -14)
+    with backend.db.engine.begin() as connection:
+        for month in (oldest, this_month):
+            connection.execute(text("INSERT INTO receipt_audit (receipt_id, supervisor_id, action, action_timestamp) "
+                                    "VALUES (:receipt, :supervisor, 'Rejected', :at)"),
+                               {"receipt": receipt_id, "supervisor": supervisor_id, "at": month})
+    backend.upgrade_database()
+
+    assert set(backend.audit_partitions()) == {backend.add_months(oldest, offset) for offset in range(14 + 4)}
+    rows = backend.db.session.execute(text(
+        "SELECT tableoid::regclass::text FROM receipt_audit ORDER BY action_timestamp")).scalars().all()
+    assert rows == [f"receipt_audit_y{month:%Y}m{month:%m}" for month in (oldest, this_month)]
+    # The id sequence carried over
+    new = backend.ReceiptAudit(receipt_id=receipt_id, supervisor_id=supervisor_id, action='Approved')
+    backend.db.session.add(new)
+    backend.db.session.commit()
+    assert new.id == 3
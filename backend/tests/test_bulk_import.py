@@ -0,0 +1,48 @@
+import json
+
+import pytest
+
+import backend
+from bulk_import import validate_record
+
+
+@pytest.mark.parametrize("record, error", [
+    ({"category": "Food", "store": 12}, "store must be a string"),
+    ({"category": ["Food"]}, "category must be a string"),
+    ({"category": "Food", "items": [{"name": 7, "amount": 1}]}, "item name must be a string"),
+    ({"category": "Food", "items": {"name": "Milk", "amount": 1}}, "items must be a list"),
+    ({"category": "Food", "extracted_text": {"text": "x"}}, "extracted_text must be a string"),
+    ({"category": "Food", "items": [{"name": "Milk", "amount": "inf"}]}, "Invalid item amount"),
+    ({"category": "Food", "items": [{"name": "Milk", "amount": "nan"}]}, "Invalid item amount"),
+    ({"category": "Food", "items": [{"name": "Milk", "amount": 1e12}]}, "Invalid item amount"),
+    ({"category": "x" * 51}, "category is longer than 50 characters"),
+])
+def test_validate_record_rejects_bad_values(record, error):
+    with pytest.raises(ValueError, match=error):
+        validate_record(record, default_user_id=1)
+
+
+def test_validate_record_sums_items():
+    receipt, items = validate_record({"category": " Food ", "store": "Shop", "items": [
+        {"name": "Milk", "amount": "1.50"}, {"name": "Bread", "amount": 2}, {"name": "Free", "amount": 0},
+    ]}, default_user_id=1)
+    assert receipt["category"] == "Food"
+    assert receipt["amount"] == 3.5
+    assert [item["item_name"] for item in items] == ["Milk", "Bread"]
+
+
+def test_bad_rows_are_reported_not_fatal(client, users, headers):
+    rows = [
+        {"category": "Food", "store": "Shop", "items": [{"name": "Milk", "amount": 2}]},
+        {"category": "Food", "store": 12},
+        {"category": None, "store": "Shop"},
+        {"category": "Food", "items": [{"name": "Milk", "amount": "inf"}]},
+        {"category": "Travel", "store": "Taxi", "items": [{"name": "Ride", "amount": 20}]},
+    ]
+    body = "\n".join(json.dumps(row) for row in rows)
+    response = client.post('/bulk-receipts', headers=headers["admin"], data=body, content_type='application/x-ndjson')
+
+    assert response.status_code == 200
+    assert response.json["imported"] == 2
+    assert [error["row"] for error in response.json["errors"]] == [2, 3, 4]
+    assert backend.Receipt.query.count() == 2
@@ -0,0 +1,131 @@
+"""/bulk-update-receipt-status: audit rows, skipped and failed updates, data versions and rollups."""
+import pytest
+
+import backend
+from conftest import add_receipt
+from test_statistics import assert_same, legacy_statistics, seed
+
+
+def bulk_update(client, headers, **body):
+    return client.post('/bulk-update-receipt-status', headers=headers, json=body)
+
+
+def audit_rows():
+    return {(row.receipt_id, row.action, row.comments) for row in backend.ReceiptAudit.query}
+
+
+def statuses():
+    return dict(backend.db.session.query(backend.Receipt.id, backend.Receipt.status))
+
+
+def versions(users):
+    return {scope: backend.data_version(scope)
+            for scope in ['all'] + [f"user:{user.id}" for user in users.values()]}
+
+
+def test_one_audit_row_per_changed_receipt(client, users, headers):
+    pending = [add_receipt(users["employee"], amount=amount) for amount in (5, 15, 25)]
+    approved = add_receipt(users["employee"], status="Approved")
+
+    ids = [receipt.id for receipt in pending] + [approved.id, 999999]
+    response = bulk_update(client, headers["supervisor"], status="Approved", ids=ids, comments="fine")
+    assert response.status_code == 200
+    # Already approved and missing receipts are skipped, not failed
+    assert response.json["updated"] == 3
+    assert response.json["ids"] == sorted(receipt.id for receipt in pending)
+    assert audit_rows() == {(receipt.id, "Approved", "fine") for receipt in pending}
+    supervisor_id = users["supervisor"].id
+    assert {row.supervisor_id for row in backend.ReceiptAudit.query} == {supervisor_id}
+
+    # Repeating the request changes nothing and audits nothing
+    assert bulk_update(client, headers["supervisor"], status="Approved", ids=ids).json["updated"] == 0
+    assert backend.ReceiptAudit.query.count() == 3
+
+
+def test_filter_selects_inclusive_amounts(client, users, headers):
+    receipts = [add_receipt(users["employee"], amount=amount) for amount in (5, 10, 20, 30)]
+    response = bulk_update(client, headers["admin"], status="Rejected",
+                           filter={"min_amount": "10", "max_amount": "20", "status": "Pending"})
+    assert response.status_code == 200
+    assert response.json["ids"] == [receipts[1].id, receipts[2].id]
+    assert statuses() == {receipts[0].id: "Pending", receipts[1].id: "Rejected",
+                          receipts[2].id: "Rejected", receipts[3].id: "Pending"}
+
+
+def test_versions_bump_only_for_owners_of_changed_receipts(client, users, headers):
+    mine = add_receipt(users["employee"])
+    add_receipt(users["admin"])
+    before = versions(users)
+    etag = client.get('/user-expense-history', headers=headers["employee"]).headers["ETag"]
+    admin_etag = client.get('/user-expense-history', headers=headers["admin"]).headers["ETag"]
+
+    assert bulk_update(client, headers["supervisor"], status="Approved", ids=[mine.id]).json["updated"] == 1
+    after = versions(users)
+    assert after["all"] == before["all"] + 1
+    assert after[f"user:{users['employee'].id}"] == before[f"user:{users['employee'].id}"] + 1
+    assert after[f"user:{users['admin'].id}"] == before[f"user:{users['admin'].id}"]
+    stale = client.get('/user-expense-history', headers={**headers["employee"], "If-None-Match": etag})
+    assert stale.status_code == 200 and stale.json["history"][0]["status"] == "Approved"
+    fresh = client.get('/user-expense-history', headers={**headers["admin"], "If-None-Match": admin_etag})
+    assert fresh.status_code == 304
+
+    # Nothing changed, nothing bumped
+    assert bulk_update(client, headers["supervisor"], status="Approved", ids=[mine.id]).json["updated"] == 0
+    assert versions(users) == after
+
+
+@pytest.mark.parametrize("role, body, status", [
+    ("employee", {"status": "Approved", "ids": ["{id}"]}, 403),
+    ("supervisor", {"status": "Pending", "ids": ["{id}"]}, 400),
+    ("supervisor", {"status": "Approved"}, 400),
+    ("supervisor", {"status": "Approved", "ids": ["{id}", "seven"]}, 400),
+    ("supervisor", {"status": "Approved", "filter": {"min_amount": "lots"}}, 400),
+    ("supervisor", {"status": "Approved", "ids": list(range(backend.MAX_BULK_STATUS_IDS + 1))}, 400),
+])
+def test_rejected_requests_change_nothing(client, users, headers, role, body, status):
+    receipt = add_receipt(users["employee"])
+    if "ids" in body:
+        body = dict(body, ids=[receipt.id if value == "{id}" else value for value in body["ids"]])
+    before = versions(users)
+
+    assert bulk_update(client, headers[role], **body).status_code == status
+    assert statuses() == {receipt.id: "Pending"}
+    assert backend.ReceiptAudit.query.count() == 0
+    assert versions(users) == before
+
+
+def test_a_failure_part_way_rolls_back_the_whole_batch(client, users, headers, monkeypatch):
+    seed(users, count=30)
+    expected = legacy_statistics(backend.Receipt.query.all(), include_stores=True)
+    before_statuses, before_versions = statuses(), versions(users)
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("rollup write failed")
+    # By then the receipts and their rollups are already updated
+    monkeypatch.setattr(backend, 'bump_data_versions', fail)
+    with pytest.raises(RuntimeError):
+        bulk_update(client, headers["supervisor"], status="Approved", filter={"status": "Pending"})
+    backend.db.session.rollback()
+
+    assert statuses() == before_statuses
+    assert backend.ReceiptAudit.query.count() == 0
+    assert versions(users) == before_versions
+    assert_same(client.get('/statistics', headers=headers["supervisor"]).json, expected)
+
+
+@pytest.mark.parametrize("role", ["supervisor", "employee"])
+def test_statistics_match_legacy_after_bulk_updates(client, users, headers, role):
+    seed(users, count=120)
+    pending = [receipt.id for receipt in backend.Receipt.query.filter_by(status="Pending")]
+    assert bulk_update(client, headers["supervisor"], status="Approved", ids=pending[::2]).status_code == 200
+    assert bulk_update(client, headers["admin"], status="Rejected",
+                       filter={"category": "Travel", "min_amount": "100"}).status_code == 200
+    assert bulk_update(client, headers["admin"], status="Approved", filter={"status": "Rejected"}).status_code == 200
+
+    receipts = backend.Receipt.query
+    if role == "employee":
+        receipts = receipts.filter_by(user_id=users["employee"].id)
+    expected = legacy_statistics(receipts.all(), include_stores=role == "supervisor")
+    assert_same(client.get('/statistics', headers=headers[role]).json, expected)
+    # The rollups agree with a full recount of the receipts table
+    assert backend.stored_rollups() == backend.rollups_from_receipts()
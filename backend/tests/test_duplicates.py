@@ -0,0 +1,91 @@
+import importlib
+
+import cv2
+import numpy as np
+import pytest
+
+import backend
+import duplicates
+from conftest import add_receipt
+from duplicates import MAX_PHASH_DISTANCE, hamming, image_phash, receipt_fingerprint, whole_cents
+
+
+@pytest.mark.parametrize("amount, cents", [
+    (None, 0), ('', 0), ("12.345", 1235), (2.5, 250), (float('inf'), 0), (float('nan'), 0), ("-Infinity", 0),
+])
+def test_whole_cents(amount, cents):
+    assert whole_cents(amount) == cents
+
+
+def test_fingerprint_ignores_order_case_and_punctuation():
+    typed = receipt_fingerprint("Corner Shop", "3.70", [("Milk", "2.50"), ("bread!", 1.2)])
+    scanned = receipt_fingerprint("CORNER SHOP", 3.7, [("Bread", "1.20"), ("MILK", 2.5)])
+    assert typed == scanned
+    assert receipt_fingerprint("Corner Shop", float('inf'), [("Milk", float('nan'))]) is not None
+    assert receipt_fingerprint("Corner Shop", None, []) is None
+
+
+@pytest.mark.parametrize("setting, distance, blocks", [("3", 3, 4), ("7", 7, 8), ("10", 10, 16), ("40", 15, 16)])
+def test_blocks_are_sized_from_the_distance(monkeypatch, setting, distance, blocks):
+    monkeypatch.setenv('DUPLICATE_PHASH_DISTANCE', setting)
+    try:
+        module = importlib.reload(duplicates)
+        assert (module.MAX_PHASH_DISTANCE, module.PHASH_BLOCKS) == (distance, blocks)
+        # Any hash within the distance still shares enough whole blocks
+        phash = 0x0123456789ABCDEF
+        near = phash ^ sum(1 << bit for bit in range(0, 64, 64 // distance)[:distance])
+        assert hamming(phash, near) == distance
+        shared = set(module.phash_blocks(phash)) & set(module.phash_blocks(near))
+        assert len(shared) >= module.PHASH_MIN_MATCHING_BLOCKS >= 1
+    finally:
+        monkeypatch.delenv('DUPLICATE_PHASH_DISTANCE')
+        importlib.reload(duplicates)
+
+
+def photo(seed):
+    rng = np.random.default_rng(seed)
+    noise = rng.integers(0, 256, (24, 16)).astype(np.uint8)
+    return cv2.resize(cv2.GaussianBlur(noise, (5, 5), 0), (400, 600), interpolation=cv2.INTER_CUBIC)
+
+
+def rephotograph(image):
+    # Slightly rotated and closer, darker, and saved as a low-quality JPEG
+    height, width = image.shape
+    turned = cv2.warpAffine(image, cv2.getRotationMatrix2D((width / 2, height / 2), 3, 0.95), (width, height),
+                            borderMode=cv2.BORDER_REPLICATE)
+    _, encoded = cv2.imencode('.jpg', cv2.convertScaleAbs(turned, alpha=0.9, beta=12), [cv2.IMWRITE_JPEG_QUALITY, 40])
+    return cv2.imdecode(encoded, cv2.IMREAD_GRAYSCALE)
+
+
+def test_rephotographed_receipt_is_found(app, users):
+    original = image_phash(photo(0))
+    again = image_phash(rephotograph(photo(0)))
+    # Further apart than four 16-bit blocks could search
+    assert 3 < hamming(original, again) <= MAX_PHASH_DISTANCE
+
+    receipt = add_receipt(users["employee"], phash=original)
+    other = add_receipt(users["employee"], phash=image_phash(photo(1)))
+    for indexed in (receipt, other):
+        backend.index_phash(indexed.id, indexed.phash)
+    backend.db.session.commit()
+    assert [match["receipt_id"] for match in backend.find_duplicates(phash=again)] == [receipt.id]
+
+
+def test_find_duplicates_reindexes_hashes_from_another_block_layout(app, users):
+    phash = image_phash(photo(0))
+    receipt = add_receipt(users["employee"], phash=phash)
+    # Four 16-bit blocks numbered 0-3, as indexed before the block layout followed the distance
+    backend.db.session.add_all(backend.ReceiptPhashBlock(block=block, value=(phash >> (block * 16)) & 0xFFFF,
+                                                         receipt_id=receipt.id) for block in range(4))
+    again = add_receipt(users["employee"], phash=image_phash(rephotograph(photo(0))))
+    backend.index_phash(again.id, again.phash)
+    backend.db.session.commit()
+    assert backend.find_duplicates(phash=again.phash, exclude_id=again.id) == []
+
+    backend.db.session.rollback()
+    result = app.test_cli_runner().invoke(args=['find-duplicates'])
+    assert result.exit_code == 0, result.output
+    assert "re-indexed 1" in result.output
+    blocks = backend.db.session.query(backend.ReceiptPhashBlock.block).filter_by(receipt_id=receipt.id).all()
+    assert sorted(block for (block,) in blocks) == list(duplicates.PHASH_BLOCK_IDS)
+    assert backend.db.session.get(backend.Receipt, again.id).duplicate_of_id == receipt.id
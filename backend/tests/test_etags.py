@@ -0,0 +1,69 @@
+import pytest
+
+from conftest import add_receipt
+
+
+def revalidate(client, path, headers, etag):
+    return client.get(path, headers={**headers, "If-None-Match": etag})
+
+
+def test_unchanged_data_gets_a_304(client, users, headers):
+    add_receipt(users["employee"])
+    first = client.get('/all-expense-history', headers=headers["supervisor"])
+    assert first.status_code == 200
+    assert revalidate(client, '/all-expense-history', headers["supervisor"], first.headers["ETag"]).status_code == 304
+
+
+def test_editing_a_non_rollup_column_invalidates(client, users, headers):
+    # Deleting the original clears duplicate_of on the employee's receipt; their rollups stay as they were
+    original = add_receipt(users["supervisor"], store="Shop")
+    add_receipt(users["employee"], store="Shop", duplicate_of_id=original.id)
+    first = client.get('/user-expense-history', headers=headers["employee"])
+    assert first.json["history"][0]["duplicate_of"] == original.id
+
+    assert client.delete(f'/delete-receipt/{original.id}', headers=headers["admin"]).status_code == 200
+    second = revalidate(client, '/user-expense-history', headers["employee"], first.headers["ETag"])
+    assert second.status_code == 200
+    assert second.json["history"][0]["duplicate_of"] is None
+
+
+# Every receipt write path: (method, path, role, JSON body or raw NDJSON body, given the seeded receipt id)
+WRITES = {
+    "manual receipt": ('post', '/manual-receipt', "employee",
+                       lambda receipt_id: {"store": "Shop", "category": "Food", "items": [{"name": "Tea", "amount": 2}]}),
+    "status": ('post', '/update-receipt-status/{id}', "supervisor",
+               lambda receipt_id: {"status": "Approved"}),
+    "bulk status": ('post', '/bulk-update-receipt-status', "supervisor",
+                    lambda receipt_id: {"status": "Rejected", "ids": [receipt_id]}),
+    "bulk import": ('post', '/bulk-receipts', "admin",
+                    lambda receipt_id: '{"category": "Food", "items": [{"name": "Tea", "amount": 2}]}'),
+    "delete": ('delete', '/delete-receipt/{id}', "admin", lambda receipt_id: None),
+}
+
+
+@pytest.mark.parametrize("write", WRITES)
+def test_every_write_path_invalidates(client, users, headers, write):
+    receipt = add_receipt(users["employee"])
+    etag = client.get('/all-expense-history', headers=headers["supervisor"]).headers["ETag"]
+
+    method, path, role, body = WRITES[write]
+    body = body(receipt.id)
+    kwargs = {"data": body, "content_type": 'application/x-ndjson'} if isinstance(body, str) else {"json": body}
+    response = getattr(client, method)(path.format(id=receipt.id), headers=headers[role], **kwargs)
+    assert response.status_code in (200, 201), response.json
+
+    assert revalidate(client, '/all-expense-history', headers["supervisor"], etag).status_code == 200
+
+
+@pytest.mark.parametrize("path, role", [('/delete-user/{id}', "admin"), ('/delete-account', "supervisor")])
+def test_deleting_a_user_invalidates_owners_of_their_duplicates(client, users, headers, path, role):
+    original = add_receipt(users["supervisor"], store="Shop")
+    add_receipt(users["employee"], store="Shop", duplicate_of_id=original.id)
+    first = client.get('/user-expense-history', headers=headers["employee"])
+    assert first.json["history"][0]["duplicate_of"] == original.id
+
+    response = client.delete(path.format(id=users["supervisor"].id), headers=headers[role])
+    assert response.status_code == 200, response.json
+    second = revalidate(client, '/user-expense-history', headers["employee"], first.headers["ETag"])
+    assert second.status_code == 200
+    assert second.json["history"][0]["duplicate_of"] is None
@@ -0,0 +1,39 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+import backend
+from conftest import add_receipt
+
+pytest.importorskip('pyarrow')
+import pyarrow.dataset as ds  # noqa: E402
+
+
+def item_names(directory):
+    table = ds.dataset(str(directory / 'receipt_items'), format='parquet', partitioning='hive').to_table()
+    return sorted(table.column('item_name').to_pylist())
+
+
+def export(app, directory, *args):
+    backend.db.session.rollback()  # the command reads from its own session
+    return app.test_cli_runner().invoke(args=['export-data', str(directory), '--table', 'receipt_items', *args])
+
+
+def test_incremental_exports_are_append_only_and_full_ones_catch_up(app, users, tmp_path):
+    last_month = datetime.utcnow() - timedelta(days=30)
+    receipt = add_receipt(users["employee"], items=[("Milk", 2)], uploaded_at=last_month)
+    add_receipt(users["employee"], items=[("Tea", 1)], uploaded_at=last_month + timedelta(hours=1))
+    assert export(app, tmp_path / 'daily').exit_code == 0
+
+    receipt = backend.db.session.get(backend.Receipt, receipt.id)
+    receipt.items = [backend.ReceiptItem(item_name="Oat milk", amount=2)]
+    backend.db.session.commit()
+    assert export(app, tmp_path / 'daily').exit_code == 0
+    assert item_names(tmp_path / 'daily') == ["Milk", "Tea"]
+
+    refused = export(app, tmp_path / 'daily', '--full')
+    assert refused.exit_code != 0
+    assert "needs a new directory" in refused.output
+
+    assert export(app, tmp_path / 'weekly', '--full').exit_code == 0
+    assert item_names(tmp_path / 'weekly') == ["Oat milk", "Tea"]
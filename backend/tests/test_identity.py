@@ -0,0 +1,104 @@
+"""Caller identity: cached role table, per-request resolution and the TRUST_ROLE_CLAIM shortcut."""
+import pytest
+from flask_jwt_extended import verify_jwt_in_request
+from sqlalchemy import update
+
+import backend
+from conftest import ROLE_IDS, auth_headers
+
+
+@pytest.fixture(autouse=True)
+def role_changes(monkeypatch):
+    # User ids restart with every test database
+    monkeypatch.setattr(backend, '_role_changed_at', {})
+
+
+def resolved_role(client, headers):
+    response = client.get('/fetch-receipts', headers=headers)
+    return response.json["role"] if response.status_code == 200 else response.status_code
+
+
+def set_role(user, role):
+    backend.db.session.execute(update(backend.User).filter_by(id=user.id).values(role_id=ROLE_IDS[role]))
+    backend.db.session.commit()
+
+
+def test_role_table_is_cached_until_invalidated(app, query_counter):
+    assert backend.role_names() == {1: "Employee", 2: "Supervisor", 3: "Admin"}
+    query_counter.reset()
+    backend.role_names()
+    assert query_counter.count() == 0
+
+    backend.db.session.execute(update(backend.UserRole).filter_by(id=3).values(role="Administrator"))
+    backend.db.session.commit()
+    assert backend.role_names()[3] == "Admin"
+    backend.invalidate_role_cache()
+    assert backend.role_names()[3] == "Administrator"
+
+
+def test_identity_is_resolved_once_per_request(app, client, users, headers, query_counter):
+    backend.role_names()
+    employee_id = users["employee"].id
+    with app.test_request_context(headers=headers["employee"]):
+        verify_jwt_in_request()
+        backend.reset_identity()  # no before-request hooks here
+        query_counter.reset()
+        assert backend.current_identity() == (employee_id, "employee")
+        assert backend.current_identity() == (employee_id, "employee")
+        assert query_counter.count() == 1
+
+    # The test client shares one app context (and so flask.g) across requests; each resolves afresh
+    assert resolved_role(client, headers["employee"]) == "employee"
+    assert resolved_role(client, headers["supervisor"]) == "supervisor"
+    assert resolved_role(client, headers["employee"]) == "employee"
+
+
+def test_role_change_applies_to_the_next_request(client, users, headers):
+    employee = users["employee"]
+    assert resolved_role(client, headers["employee"]) == "employee"
+    assert client.get('/all-expense-history', headers=headers["employee"]).status_code == 403
+
+    # Promoted through the API: the token still claims "employee"
+    response = client.post(f'/update-user-role/{employee.id}', headers=headers["admin"], json={"role": "Supervisor"})
+    assert response.status_code == 200
+    assert resolved_role(client, headers["employee"]) == "supervisor"
+    assert client.get('/all-expense-history', headers=headers["employee"]).status_code == 200
+
+    # Demoted straight in the database, with no cache invalidation at all
+    set_role(employee, "employee")
+    assert resolved_role(client, headers["employee"]) == "employee"
+    assert client.get('/all-expense-history', headers=headers["employee"]).status_code == 403
+
+
+def test_stale_claim_is_ignored_by_default(client, users):
+    forged = auth_headers(users["employee"], role="admin")
+    assert resolved_role(client, forged) == "employee"
+    assert client.delete('/delete-receipt/1', headers=forged).status_code == 403
+
+    # A deleted user's token stops working at once
+    backend.db.session.delete(users["employee"])
+    backend.db.session.commit()
+    assert resolved_role(client, forged) == 404
+
+
+def test_trusted_claim_skips_the_lookup_until_the_role_changes(app, client, users, headers, monkeypatch,
+                                                               query_counter):
+    monkeypatch.setattr(backend, 'TRUST_ROLE_CLAIM', True)
+    employee = users["employee"]
+    set_role(employee, "supervisor")
+    # Without a recorded change the claim wins, so the database edit goes unnoticed
+    assert resolved_role(client, headers["employee"]) == "employee"
+
+    # Role changes made through the API distrust tokens issued before them
+    response = client.post(f'/update-user-role/{employee.id}', headers=headers["admin"], json={"role": "Admin"})
+    assert response.status_code == 200
+    assert resolved_role(client, headers["employee"]) == "admin"
+
+    # A trusted claim costs no queries at all
+    supervisor_id = users["supervisor"].id
+    with app.test_request_context(headers=headers["supervisor"]):
+        verify_jwt_in_request()
+        backend.reset_identity()  # no before-request hooks here
+        query_counter.reset()
+        assert backend.current_identity() == (supervisor_id, "supervisor")
+        assert query_counter.count() == 0
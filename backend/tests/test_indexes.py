@@ -0,0 +1,35 @@
+"""The hot receipt queries must be servable by index scans (PostgreSQL only; see benchmarks/explain_check.py)."""
+import pytest
+from sqlalchemy import text
+
+import backend
+from backend import Receipt, ReceiptAudit, ReceiptItem
+
+# Built inside the test, where Model.query has an app context
+HOT_QUERIES = {
+    "employee history": lambda: Receipt.query.filter_by(user_id=1).order_by(Receipt.uploaded_at.desc()),
+    "supervisor keyset page": lambda: Receipt.query.order_by(Receipt.uploaded_at.desc(), Receipt.id.desc()).limit(50),
+    "pending approval queue": lambda: Receipt.query.filter_by(status='Pending'),
+    "items by receipt": lambda: ReceiptItem.query.filter_by(receipt_id=1),
+    "audit by receipt": lambda: ReceiptAudit.query.filter_by(receipt_id=1),
+}
+
+
+def plan_nodes(plan):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+@pytest.mark.parametrize("name", HOT_QUERIES)
+def test_hot_query_uses_an_index(app, name):
+    if backend.db.engine.dialect.name != 'postgresql':
+        pytest.skip("EXPLAIN checks need PostgreSQL (set TEST_DATABASE_URL)")
+    # With sequential scans disabled the planner shows whether an index *can* serve the query,
+    # even on an empty table
+    backend.db.session.execute(text("SET LOCAL enable_seqscan = off"))
+    sql = str(HOT_QUERIES[name]().statement.compile(backend.db.engine, compile_kwargs={"literal_binds": True}))
+    plan = backend.db.session.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()[0]["Plan"]
+
+    scans = [node["Node Type"] for node in plan_nodes(plan) if "Scan" in node["Node Type"]]
+    assert scans and "Seq Scan" not in scans, f"{name}: {scans}"
@@ -0,0 +1,122 @@
+"""Receipt listings: keyset cursors, filters, ?fields= projection and NDJSON streaming."""
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from conftest import add_receipt
+
+NOW = datetime(2026, 10, 1, 12, 0, 0)
+
+
+def seed(users):
+    """Seven receipts: three uploaded at the same moment, the rest a day apart."""
+    employee, supervisor = users["employee"], users["supervisor"]
+    return [
+        add_receipt(employee, store="Tie A", amount=5, items=[("Tea", 2), ("Cake", 3)], uploaded_at=NOW),
+        add_receipt(supervisor, store="Tie B", amount=15, status="Approved", uploaded_at=NOW),
+        add_receipt(employee, store="Tie C", amount=25, category="Travel", uploaded_at=NOW),
+        add_receipt(employee, store="Older", amount=35, status="Rejected", uploaded_at=NOW - timedelta(days=1)),
+        add_receipt(supervisor, store="Oldest", amount=45, category="Travel", uploaded_at=NOW - timedelta(days=2)),
+        add_receipt(employee, store="Newer", amount=55, uploaded_at=NOW + timedelta(days=1)),
+        add_receipt(employee, store="Newest", amount=65, status="Approved", uploaded_at=NOW + timedelta(days=2)),
+    ]
+
+
+def newest_first(receipts):
+    return [receipt.id for receipt in sorted(receipts, key=lambda receipt: (receipt.uploaded_at, receipt.id),
+                                             reverse=True)]
+
+
+def get(client, path, headers, **args):
+    response = client.get(path, headers=headers, query_string=args)
+    assert response.status_code == 200, response.data
+    return response
+
+
+def pages(client, path, headers, key, id_key, limit, **args):
+    ids, cursor = [], None
+    while True:
+        body = get(client, path, headers, limit=limit, **args, **({"cursor": cursor} if cursor else {})).json
+        assert len(body[key]) <= limit
+        ids += [entry[id_key] for entry in body[key]]
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return ids
+
+
+@pytest.mark.parametrize("path, role, key, id_key", [
+    ('/fetch-receipts', "supervisor", "receipts", "id"),
+    ('/all-expense-history', "admin", "history", "receipt_id"),
+    ('/user-expense-history', "employee", "history", "receipt_id"),
+])
+@pytest.mark.parametrize("limit", [1, 2, 3])
+def test_cursor_pages_are_stable_across_ties(client, users, headers, path, role, key, id_key, limit):
+    receipts = seed(users)
+    if path == '/user-expense-history':
+        receipts = [receipt for receipt in receipts if receipt.user_id == users["employee"].id]
+    full = [entry[id_key] for entry in get(client, path, headers[role]).json[key]]
+    assert full == newest_first(receipts)
+    assert pages(client, path, headers[role], key, id_key, limit) == full
+
+
+@pytest.mark.parametrize("args", [
+    {"cursor": "not a cursor"}, {"cursor": "MjAyNi0xMC0wMQ=="}, {"limit": "ten"}, {"user_id": "me"},
+    {"start_date": "01/10/2026"}, {"min_amount": "lots"},
+])
+def test_invalid_cursor_or_filter_is_a_400(client, users, headers, args):
+    seed(users)
+    response = client.get('/fetch-receipts', headers=headers["supervisor"], query_string=args)
+    assert response.status_code == 400
+    assert response.json == {"error": "Invalid filter or cursor"}
+
+
+@pytest.mark.parametrize("args, stores", [
+    ({"status": "Approved"}, ["Newest", "Tie B"]),
+    ({"category": "Travel"}, ["Tie C", "Oldest"]),
+    ({"user_id": "{supervisor}"}, ["Tie B", "Oldest"]),
+    ({"start_date": "2026-09-30", "end_date": "2026-10-01"}, ["Tie C", "Tie B", "Tie A", "Older"]),
+    ({"min_amount": "20", "max_amount": "50"}, ["Tie C", "Older", "Oldest"]),
+    ({"status": "Pending", "category": "Food", "limit": "2"}, ["Newer", "Tie A"]),
+])
+def test_filters(client, users, headers, args, stores):
+    seed(users)
+    args = {name: value.format(supervisor=users["supervisor"].id) for name, value in args.items()}
+    receipts = get(client, '/fetch-receipts', headers["supervisor"], **args).json["receipts"]
+    assert [receipt["storeName"] for receipt in receipts] == stores
+
+
+def test_employees_only_list_their_own_receipts(client, users, headers):
+    seed(users)
+    receipts = get(client, '/fetch-receipts', headers["employee"], user_id=users["supervisor"].id).json["receipts"]
+    assert receipts == []
+    receipts = get(client, '/fetch-receipts', headers["employee"]).json["receipts"]
+    assert {receipt["user"] for receipt in receipts} == {users["employee"].id}
+
+
+def test_fields_projection(client, users, headers):
+    seed(users)
+    body = get(client, '/fetch-receipts', headers["supervisor"], fields="id,amount,nonsense", limit=2).json
+    assert [set(receipt) for receipt in body["receipts"]] == [{"id", "amount"}] * 2
+    assert body["role"] == "supervisor" and body["next_cursor"]
+    history = get(client, '/all-expense-history', headers["admin"], fields="receipt_id,items").json["history"]
+    assert all(set(entry) == {"receipt_id", "items"} for entry in history)
+
+
+@pytest.mark.parametrize("path, role, key", [
+    ('/fetch-receipts', "supervisor", "receipts"),
+    ('/all-expense-history', "admin", "history"),
+    ('/user-expense-history', "employee", "history"),
+])
+def test_ndjson_streams_the_same_rows(client, users, headers, path, role, key):
+    seed(users)
+    args = {"status": "Pending", "fields": "store_name,storeName,items,amount"}
+    listed = get(client, path, headers[role], **args).json[key]
+
+    response = get(client, path, headers[role], format="ndjson", **args)
+    assert response.mimetype == 'application/x-ndjson'
+    assert response.is_streamed
+    assert [json.loads(line) for line in response.get_data(as_text=True).splitlines()] == listed
+    # ?limit= caps the stream
+    limited = get(client, path, headers[role], format="ndjson", limit=2, **args).get_data(as_text=True)
+    assert len(limited.splitlines()) == min(2, len(listed))
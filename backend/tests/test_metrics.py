@@ -0,0 +1,46 @@
+import os
+
+from metrics import STALE_FILE, Counter, Histogram, Registry, mark_process_dead, read_dump, write_dump
+
+
+def total(registry, name):
+    return sum(float(line.rsplit(' ', 1)[1]) for line in registry.render().splitlines()
+               if line.startswith(name) and not line.startswith('#'))
+
+
+def test_exited_processes_keep_counting(tmp_path):
+    registry = Registry(str(tmp_path))
+    requests = Counter(registry, 'requests_total', "Requests.", ('route',))
+    latency = Histogram(registry, 'latency_seconds', "Latency.", buckets=(1,))
+    write_dump(str(tmp_path / "999999.json"), {
+        'requests_total': [('requests_total', (('route', '/'),), 5)],
+        'latency_seconds': [('latency_seconds_count', (), 2), ('latency_seconds_sum', (), 0.5)],
+    })
+    requests.inc(route='/')
+    latency.observe(0.25)
+    assert total(registry, 'requests_total') == 6
+
+    mark_process_dead(str(tmp_path), 999999)
+    assert not os.path.exists(tmp_path / "999999.json")
+    assert os.path.exists(tmp_path / STALE_FILE)
+    assert total(registry, 'requests_total') == 6
+    assert total(registry, 'latency_seconds_count') == 3
+
+    # A second exit adds to the stale totals instead of replacing them
+    write_dump(str(tmp_path / "999998.json"), {'requests_total': [('requests_total', (('route', '/'),), 4)]})
+    mark_process_dead(str(tmp_path), 999998)
+    assert total(registry, 'requests_total') == 10
+
+
+def test_reused_pid_does_not_overwrite_the_previous_owner(tmp_path):
+    # Left behind by an exited process that had this pid
+    write_dump(str(tmp_path / f"{os.getpid()}.json"), {'requests_total': [('requests_total', (), 7)]})
+    registry = Registry(str(tmp_path))
+    requests = Counter(registry, 'requests_total', "Requests.")
+    requests.inc()
+    assert total(registry, 'requests_total') == 8
+
+    registry.dump(0.0, force=True)
+    assert total(registry, 'requests_total') == 8
+    assert read_dump(str(tmp_path / STALE_FILE)) == {'requests_total': [('requests_total', (), 7)]}
+    assert read_dump(str(tmp_path / f"{os.getpid()}.json")) == {'requests_total': [('requests_total', (), 1)]}
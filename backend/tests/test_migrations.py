@@ -0,0 +1,17 @@
+import backend
+from conftest import add_receipt
+from flask_migrate import downgrade
+from sqlalchemy import inspect, text
+
+
+def test_downgrading_0002_keeps_the_tables_it_adopted(app, users):
+    add_receipt(users["employee"], items=[("Tea", 2)])
+    backend.db.session.remove()
+
+    downgrade(revision='0001')
+    assert {'receipt_items', 'ocr_jobs'} <= set(inspect(backend.db.engine).get_table_names())
+    with backend.db.engine.connect() as connection:
+        assert connection.execute(text("SELECT item_name FROM receipt_items")).scalars().all() == ["Tea"]
+
+    backend.upgrade_database()
+    assert backend.db.session.query(backend.ReceiptItem.item_name).scalar() == "Tea"
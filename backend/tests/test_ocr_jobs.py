@@ -0,0 +1,124 @@
+"""OCR job queue: uploads queue a job, /ocr-jobs/<id> reports queued -> done or failed."""
+import io
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+import pytest
+
+import backend
+import ocr
+from ocr_cache import OcrCache
+
+EXTRACTED = {"store_name": "Corner Shop", "category": "Food", "amount": 3.5, "raw_text": "Corner Shop\nTea 3.50",
+             "items": [("Tea", 3.5)], "timings": {"ocr": 1.0}}
+
+
+class StubOcr:
+    """Stands in for ocr.extract_text; each call blocks until release()."""
+
+    def __init__(self):
+        self.released = threading.Event()
+        self.error = None
+        self.calls = []
+
+    def __call__(self, image_path, stages=None, engine=None):
+        self.calls.append(image_path)
+        assert self.released.wait(10)
+        if self.error:
+            raise self.error
+        return dict(EXTRACTED)
+
+    def release(self):
+        self.released.set()
+
+
+@pytest.fixture
+def stub_ocr(app, monkeypatch, tmp_path):
+    stub = StubOcr()
+    # Threads share the monkeypatched module, which the OCR process pool would not
+    pool = ThreadPoolExecutor(max_workers=2)
+    monkeypatch.setattr(ocr, 'extract_text', stub)
+    monkeypatch.setattr(backend, 'get_ocr_pool', lambda: pool)
+    monkeypatch.setattr(backend, 'ocr_cache', OcrCache(str(tmp_path / "ocr-cache")))
+    monkeypatch.setattr(backend, '_ocr_futures', {})
+    yield stub
+    stub.release()
+    pool.shutdown(wait=True)
+
+
+def receipt_image(seed=0):
+    image = np.random.default_rng(seed).integers(0, 256, (64, 48), dtype=np.uint8)
+    return io.BytesIO(cv2.imencode('.png', image)[1].tobytes())
+
+
+def upload(client, headers):
+    return client.post('/upload-receipt', headers=headers, content_type='multipart/form-data',
+                       data={"receipt": (receipt_image(), "receipt.png")})
+
+
+def job_status(client, headers, job_id, **args):
+    response = client.get(f'/ocr-jobs/{job_id}', headers=headers, query_string=args)
+    # Requests share the test's session: end the read so the pool's thread can write
+    backend.db.session.rollback()
+    return response
+
+
+def test_job_goes_from_queued_to_done(client, headers, stub_ocr):
+    response = upload(client, headers["employee"])
+    assert response.status_code == 202
+    assert response.json["status"] == 'queued'
+    job_id = response.json["job_id"]
+    assert job_status(client, headers["employee"], job_id).json == {"job_id": job_id, "status": 'queued'}
+
+    # The long-poll returns as soon as the job finishes, well before its wait is up
+    threading.Timer(0.2, stub_ocr.release).start()
+    job = job_status(client, headers["employee"], job_id, wait=10).json
+    assert job["status"] == 'done'
+    assert job["store_name"] == "Corner Shop"
+    assert job["items"] == [{"name": "Tea", "amount": 3.5}]
+    assert backend.db.session.get(backend.OcrJob, job_id).finished_at is not None
+
+    # The same image again comes straight from the OCR cache
+    again = upload(client, headers["employee"])
+    assert again.status_code == 200
+    assert again.json["cached"] is True and again.json["store_name"] == "Corner Shop"
+    assert len(stub_ocr.calls) == 1
+
+
+def test_failed_ocr_marks_the_job_failed(client, headers, stub_ocr):
+    stub_ocr.error = RuntimeError("tesseract crashed")
+    stub_ocr.release()
+    job_id = upload(client, headers["employee"]).json["job_id"]
+
+    job = job_status(client, headers["employee"], job_id, wait=10).json
+    assert job == {"job_id": job_id, "status": 'failed', "error": "OCR failed: tesseract crashed"}
+    # Failures are not cached, so a retry runs OCR again
+    stub_ocr.error = None
+    retry = upload(client, headers["employee"])
+    assert retry.status_code == 202
+    assert job_status(client, headers["employee"], retry.json["job_id"], wait=10).json["status"] == 'done'
+    assert len(stub_ocr.calls) == 2
+
+
+def test_queued_jobs_resume_after_a_restart(client, users, headers, stub_ocr, tmp_path):
+    path = tmp_path / "left-over.png"
+    path.write_bytes(receipt_image().getvalue())
+    # Queued by a process that exited before running it
+    job = backend.OcrJob(id="c" * 32, user_id=users["employee"].id, file_path=str(path), status='queued')
+    backend.db.session.add(job)
+    backend.db.session.commit()
+    assert job_status(client, headers["employee"], job.id, wait=0.5).json["status"] == 'queued'
+
+    stub_ocr.release()
+    backend.run_startup_tasks()
+    assert job_status(client, headers["employee"], job.id, wait=10).json["status"] == 'done'
+    assert stub_ocr.calls == [str(path)]
+
+
+def test_jobs_belong_to_their_uploader(client, headers, stub_ocr):
+    job_id = upload(client, headers["employee"]).json["job_id"]
+    assert job_status(client, headers["supervisor"], job_id).status_code == 404
+    assert job_status(client, headers["employee"], "missing").status_code == 404
+    assert job_status(client, headers["employee"], job_id, wait="soon").status_code == 400
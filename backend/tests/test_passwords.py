@@ -0,0 +1,113 @@
+"""Passwords: rehash on login after BCRYPT_ROUNDS changes, 503 when the hash pool is full, /bulk-users."""
+import threading
+
+import bcrypt
+import pytest
+
+import backend
+from passwords import PasswordHasher
+
+
+@pytest.fixture
+def hasher(monkeypatch):
+    """Swap in a low-cost hasher; tests adjust its settings by building another."""
+    def install(**settings):
+        hasher = PasswordHasher(**{"rounds": 4, "workers": 2, **settings})
+        monkeypatch.setattr(backend, 'passwords', hasher)
+        return hasher
+    return install
+
+
+def rounds_of(password_hash):
+    return int(password_hash.split('$')[2])
+
+
+def add_user(email, password, rounds=4):
+    user = backend.User(name="Pat", email=email, role_id=1,
+                        password_hash=bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds)).decode())
+    backend.db.session.add(user)
+    backend.db.session.commit()
+    return user
+
+
+def login(client, email, password):
+    return client.post('/login', json={"email": email, "password": password})
+
+
+def test_login_rehashes_when_the_cost_changed(client, hasher):
+    user = add_user("pat@example.com", "hunter22", rounds=4)
+    hasher(rounds=5)
+
+    assert login(client, "pat@example.com", "wrong").status_code == 401
+    backend.db.session.refresh(user)
+    assert rounds_of(user.password_hash) == 4
+
+    response = login(client, "pat@example.com", "hunter22")
+    assert response.status_code == 200 and response.json["role"] == "employee"
+    backend.db.session.refresh(user)
+    assert rounds_of(user.password_hash) == 5
+    assert bcrypt.checkpw(b"hunter22", user.password_hash.encode())
+
+    # Already at the configured cost: left alone
+    rehashed = user.password_hash
+    assert login(client, "pat@example.com", "hunter22").status_code == 200
+    backend.db.session.refresh(user)
+    assert user.password_hash == rehashed
+
+
+def test_saturated_pool_gets_a_503(client, hasher):
+    add_user("pat@example.com", "hunter22")
+    busy = hasher(workers=1, max_pending=1, queue_timeout=0.05)
+    release = threading.Event()
+    # Take the only slot
+    blocker = busy._submit(release.wait, 10)
+    try:
+        response = login(client, "pat@example.com", "hunter22")
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == '1'
+        assert "error" in response.json
+    finally:
+        release.set()
+        blocker.result()
+    assert login(client, "pat@example.com", "hunter22").status_code == 200
+
+
+def test_bulk_users(client, users, headers, hasher):
+    hasher(workers=2, max_pending=2)
+    entries = [
+        {"name": "Ann", "email": "ann@example.com", "password": "pw-ann"},
+        {"name": "Bob", "email": "bob@example.com", "password": "pw-bob", "role": "supervisor"},
+        {"name": "No Password", "email": "nopw@example.com"},
+        {"name": "Bad Role", "email": "bad@example.com", "password": "pw", "role": "owner"},
+        {"name": "Ann Again", "email": "ANN@example.com", "password": "pw"},
+        {"name": "Taken", "email": "employee@example.com", "password": "pw"},
+        {"name": "Cat", "email": "cat@example.com", "password": "pw-cat"},
+    ]
+    response = client.post('/bulk-users', headers=headers["admin"], json={"users": entries})
+    assert response.status_code == 200, response.json
+    assert [user["email"] for user in response.json["created"]] == ["ann@example.com", "bob@example.com",
+                                                                   "cat@example.com"]
+    assert response.json["errors"] == [
+        {"index": 2, "error": "name, email and password are required"},
+        {"index": 3, "error": "Invalid role"},
+        {"index": 4, "error": "Duplicate email in request"},
+        {"index": 5, "error": "Email already registered"},
+    ]
+
+    # Each hash is a real bcrypt hash of that user's password, at the configured cost
+    assert login(client, "bob@example.com", "pw-bob").json["role"] == "supervisor"
+    for entry in (entries[0], entries[6]):
+        user = backend.User.query.filter_by(email=entry["email"]).one()
+        assert rounds_of(user.password_hash) == 4
+        assert bcrypt.checkpw(entry["password"].encode(), user.password_hash.encode())
+
+
+@pytest.mark.parametrize("role, body, status", [
+    ("supervisor", {"users": [{"name": "Ann", "email": "ann@example.com", "password": "pw"}]}, 403),
+    ("admin", {"users": []}, 400),
+    ("admin", {"users": "ann"}, 400),
+    ("admin", {"users": [{}] * (backend.MAX_BULK_USERS + 1)}, 400),
+])
+def test_bulk_users_rejects(client, headers, role, body, status):
+    assert client.post('/bulk-users', headers=headers[role], json=body).status_code == status
+    assert backend.User.query.filter_by(email="ann@example.com").first() is None
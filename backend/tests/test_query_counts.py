@@ -0,0 +1,47 @@
+"""History and detail routes must run a fixed number of queries however many receipts they return."""
+import pytest
+
+import backend
+from conftest import add_receipt
+
+
+def seed_receipts(users, count):
+    for n in range(count):
+        owner = users["employee"] if n % 2 else users["supervisor"]
+        receipt = add_receipt(owner, store=f"Store {n}", items=[(f"item {n}", 1), (f"other {n}", 2)])
+        backend.db.session.add(backend.ReceiptAudit(receipt_id=receipt.id, supervisor_id=users["admin"].id,
+                                                    action="Approved", comments="ok"))
+    backend.db.session.commit()
+    return [receipt.id for receipt in backend.Receipt.query.all()]
+
+
+def statements(client, query_counter, path, headers, **kwargs):
+    client.get(path, headers=headers, **kwargs)  # warm the role cache
+    backend.response_cache._entries.clear()
+    query_counter.reset()
+    response = client.get(path, headers=headers, **kwargs)
+    assert response.status_code == 200
+    return query_counter.count()
+
+
+@pytest.mark.parametrize("path, role", [
+    ('/all-expense-history', "admin"),
+    ('/user-expense-history', "employee"),
+    ('/receipt-details', "admin"),
+])
+def test_query_count_does_not_grow_with_receipts(client, users, headers, query_counter, path, role):
+    seed_receipts(users, 2)
+    few = statements(client, query_counter, path, headers[role])
+    seed_receipts(users, 20)
+    many = statements(client, query_counter, path, headers[role])
+    assert few == many
+
+
+def test_receipt_details_by_ids_is_flat(client, users, headers, query_counter):
+    ids = seed_receipts(users, 2)
+    few = statements(client, query_counter, '/receipt-details', headers["admin"],
+                     query_string={"ids": ",".join(map(str, ids))})
+    ids = seed_receipts(users, 20)
+    many = statements(client, query_counter, '/receipt-details', headers["admin"],
+                      query_string={"ids": ",".join(map(str, ids))})
+    assert few == many
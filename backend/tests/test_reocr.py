@@ -0,0 +1,25 @@
+import backend
+from conftest import add_receipt
+
+RECEIPT_TEXT = "TESCO\nMilk 2.50\nBread 1.20\n"
+
+
+def test_reocr_invalidates_cached_reads_when_only_items_change(app, client, users, headers, tmp_path):
+    # Same store, category and total after re-parsing, so no rollup moves
+    receipt = add_receipt(users["employee"], store="Tesco", category="Food", amount=3.70,
+                          items=[("milk and bread", 3.70)], extracted_text=RECEIPT_TEXT)
+    first = client.get('/user-expense-history', headers=headers["employee"])
+    assert first.status_code == 200
+    backend.db.session.rollback()  # the CLI command writes from its own session
+
+    result = app.test_cli_runner().invoke(args=[
+        'reocr', '--reparse-only', '--workers', '1', '--checkpoint', str(tmp_path / 'checkpoint.json')])
+    assert result.exception is None, result.output
+    assert "1 updated" in result.output
+
+    second = client.get('/user-expense-history', headers={**headers["employee"], "If-None-Match": first.headers["ETag"]})
+    assert second.status_code == 200
+    assert second.headers["ETag"] != first.headers["ETag"]
+    items = second.json["history"][0]["items"]
+    assert sorted(item["name"] for item in items) == ["Bread", "Milk"]
+    assert backend.db.session.get(backend.Receipt, receipt.id).amount == backend.Decimal("3.70")
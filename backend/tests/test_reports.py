@@ -0,0 +1,66 @@
+import time
+from datetime import datetime
+
+import backend
+from conftest import add_receipt, auth_headers
+
+
+def wait_for_job(client, headers, job_id, timeout=10):
+    deadline = time.monotonic() + timeout
+    while True:
+        job = client.get(f'/reports/jobs/{job_id}', headers=headers).json
+        # Requests share the test's app context and session: end the read so the job's thread can write
+        backend.db.session.rollback()
+        if job["status"] in ('done', 'failed') or time.monotonic() > deadline:
+            return job
+        time.sleep(0.05)
+
+
+def test_shared_report_job_is_readable_by_every_requester(client, users, headers, monkeypatch):
+    add_receipt(users["employee"], amount=12)
+    second = backend.User(name="Second Supervisor", email="second@example.com", password_hash="!", role_id=2)
+    backend.db.session.add(second)
+    backend.db.session.commit()
+    second_headers = auth_headers(second)
+    query = {"scope": "org", "format": "csv", "background": "true"}
+
+    # Keep the job queued so the second request finds it in flight
+    submit = backend.submit_report_job
+    monkeypatch.setattr(backend, 'submit_report_job', lambda job_id: None)
+    first = client.get('/reports', headers=headers["supervisor"], query_string=query)
+    shared = client.get('/reports', headers=second_headers, query_string=query)
+    assert first.status_code == shared.status_code == 202
+    assert shared.json["job_id"] == first.json["job_id"]
+    job_id = first.json["job_id"]
+
+    submit(job_id)
+    assert wait_for_job(client, second_headers, job_id)["status"] == 'done'
+    for requester in (headers["supervisor"], second_headers):
+        response = client.get(f'/reports/jobs/{job_id}/download', headers=requester)
+        assert response.status_code == 200
+        assert b"12.00" in response.data
+
+    # Employees may not read an organisation-wide report
+    assert client.get(f'/reports/jobs/{job_id}', headers=headers["employee"]).status_code == 404
+
+
+def test_jobs_whose_lease_ran_out_are_resubmitted_when_polled(client, users, headers, monkeypatch):
+    add_receipt(users["employee"], amount=7)
+    make_key = backend.ReportCache.make_key
+    now = datetime.utcnow()
+    # One job still being built elsewhere, one whose worker was killed mid-build
+    live, stale = (
+        backend.ReportJob(id=letter * 32, user_id=users["supervisor"].id, scope="org", format="csv",
+                          cache_key=make_key("org:None", "all", letter), status="running", updated_at=updated_at)
+        for letter, updated_at in (("a", now), ("b", now - backend.REPORT_JOB_LEASE * 2))
+    )
+    backend.db.session.add_all([live, stale])
+    backend.db.session.commit()
+
+    submitted = []
+    submit = backend.submit_report_job
+    monkeypatch.setattr(backend, 'submit_report_job', lambda job_id: submitted.append(job_id) or submit(job_id))
+    assert client.get(f'/reports/jobs/{live.id}', headers=headers["supervisor"]).json["status"] == 'running'
+    assert wait_for_job(client, headers["supervisor"], stale.id)["status"] == 'done'
+    # Later polls find the job finished or leased again, so it is resubmitted once
+    assert submitted == [stale.id]
@@ -0,0 +1,38 @@
+import backend
+from conftest import add_receipt
+from sqlalchemy import update
+
+
+def search(client, headers, q, **args):
+    response = client.get('/search', headers=headers, query_string={"q": q, **args})
+    assert response.status_code == 200, response.json
+    return response.json
+
+
+def test_receipts_without_a_store_name_rank_as_numbers(client, users, headers):
+    named = add_receipt(users["employee"], store="Corner Bakery", items=[("Bread", 3)])
+    unnamed = add_receipt(users["employee"], items=[("Bread", 4)])
+    # The column is nullable with only an ORM-side default, so older and hand-written rows can be NULL
+    backend.db.session.execute(update(backend.Receipt).filter_by(id=unnamed.id).values(store_name=None))
+    backend.db.session.commit()
+
+    results = search(client, headers["employee"], "bread")["results"]
+    assert {result["id"] for result in results} == {named.id, unnamed.id}
+    assert all(isinstance(result["rank"], float) for result in results)
+    # Best matches first: a NULL rank would sort ahead of every real one
+    assert [result["rank"] for result in results] == sorted((result["rank"] for result in results), reverse=True)
+    if backend.db.engine.dialect.name == 'postgresql':
+        assert results[0]["id"] == named.id
+
+
+def test_search_is_scoped_and_paged(client, users, headers):
+    for _ in range(3):
+        add_receipt(users["employee"], store="Corner Bakery")
+    add_receipt(users["supervisor"], store="Corner Bakery")
+
+    assert len(search(client, headers["supervisor"], "bakery")["results"]) == 4
+    first = search(client, headers["employee"], "bakery", limit=2)
+    assert len(first["results"]) == 2 and first["next_offset"] == 2
+    rest = search(client, headers["employee"], "bakery", limit=2, offset=first["next_offset"])
+    assert len(rest["results"]) == 1 and rest["next_offset"] is None
+    assert client.get('/search', headers=headers["employee"]).status_code == 400
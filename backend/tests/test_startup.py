@@ -0,0 +1,47 @@
+import os
+import runpy
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+
+import backend
+from conftest import add_receipt
+from test_reports import wait_for_job
+
+GUNICORN_CONF = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'gunicorn.conf.py')
+
+
+def test_refuses_to_start_without_a_database_url_or_jwt_secret(monkeypatch):
+    for name in ('EERIS_ENV', 'DATABASE_URL', 'JWT_SECRET_KEY'):
+        monkeypatch.delenv(name, raising=False)
+    with pytest.raises(RuntimeError, match="DATABASE_URL and JWT_SECRET_KEY"):
+        backend.create_app()
+    monkeypatch.setenv('DATABASE_URL', 'sqlite://')
+    with pytest.raises(RuntimeError, match="JWT_SECRET_KEY"):
+        backend.create_app()
+
+    # Only development and testing fall back to the local defaults
+    monkeypatch.setenv('EERIS_ENV', 'development')
+    assert backend.create_app().config['JWT_SECRET_KEY']
+
+
+def test_only_the_first_worker_runs_startup_tasks():
+    with mock.patch.dict(os.environ):  # the config sets OCR_MODE and STATEMENT_TIMEOUT_MS defaults
+        hooks = runpy.run_path(GUNICORN_CONF)
+    server = SimpleNamespace()
+    workers = [SimpleNamespace() for _ in range(3)]
+    for worker in workers:
+        hooks['pre_fork'](server, worker)
+    assert [worker.run_startup_tasks for worker in workers] == [True, False, False]
+
+
+def test_startup_tasks_resume_queued_report_jobs(client, users, headers):
+    add_receipt(users["employee"], amount=3)
+    job = backend.ReportJob(id="a" * 32, user_id=users["supervisor"].id, scope="org", format="csv",
+                            cache_key=backend.ReportCache.make_key("org:None", "all", "left over"), status="running")
+    backend.db.session.add(job)
+    backend.db.session.commit()
+
+    backend.run_startup_tasks()
+    assert wait_for_job(client, headers["supervisor"], job.id)["status"] == 'done'
@@ -0,0 +1,113 @@
+"""/statistics, read from receipt_rollups, against the per-receipt loop it replaced."""
+import random
+
+import pytest
+
+import backend
+from conftest import add_receipt
+
+STORES = ["Walmart", "Target", "Costco", None]
+CATEGORIES = ["Food", "Travel", "Office Supplies", "Other"]
+STATUSES = ["Pending", "Approved", "Rejected"]
+
+
+def legacy_statistics(receipts, include_stores):
+    """The Python implementation /statistics used before rollups, over a list of receipts."""
+    valid_receipts = [r for r in receipts if r.status.lower() != 'rejected']
+
+    category_totals = {}
+    for r in valid_receipts:
+        if r.category not in category_totals:
+            category_totals[r.category] = 0.0
+        if r.amount:
+            category_totals[r.category] += float(r.amount)
+
+    response = {
+        "category_totals": category_totals,
+        "approvals": sum(1 for r in receipts if r.status.lower() == 'approved'),
+        "rejections": sum(1 for r in receipts if r.status.lower() == 'rejected'),
+        "pending": sum(1 for r in receipts if r.status.lower() == 'pending'),
+    }
+
+    if include_stores:
+        store_totals = {}
+        store_categories = {}
+        for r in valid_receipts:
+            store = r.store_name or "Unknown Store"
+            if store not in store_totals:
+                store_totals[store] = 0.0
+                store_categories[store] = {}
+            if r.amount:
+                store_totals[store] += float(r.amount)
+                store_categories[store].setdefault(r.category, 0.0)
+                store_categories[store][r.category] += float(r.amount)
+        response["store_totals"] = store_totals
+        response["store_main_categories"] = {
+            store: max(cats.items(), key=lambda x: x[1])[0] if cats else "unknown"
+            for store, cats in store_categories.items()
+        }
+
+    user_totals = {}
+    for r in valid_receipts:
+        user = backend.db.session.get(backend.User, r.user_id)
+        name = user.name if user else "Unknown User"
+        user_totals.setdefault(name, 0.0)
+        if r.amount:
+            user_totals[name] += float(r.amount)
+    response["user_totals"] = user_totals
+    return response
+
+
+def seed(users, count=300, seed=20250427):
+    rng = random.Random(seed)
+    owners = list(users.values())
+    for _ in range(count):
+        # Amounts in cents, so no two store/category totals tie; None and 0 stay out of the store breakdown
+        amount = rng.choice([None, 0] + [rng.randint(1, 50000) / 100 for _ in range(8)])
+        add_receipt(rng.choice(owners), store=rng.choice(STORES), category=rng.choice(CATEGORIES),
+                    amount=amount, status=rng.choice(STATUSES))
+
+
+def assert_same(actual, expected):
+    assert actual.keys() == expected.keys()
+    for key, value in expected.items():
+        # Totals were float sums per receipt and are now decimal sums per group
+        if key.endswith("_totals"):
+            assert actual[key] == pytest.approx(value), key
+        else:
+            assert actual[key] == value, key
+
+
+@pytest.mark.parametrize("role", ["supervisor", "employee"])
+def test_statistics_match_legacy(client, users, headers, role):
+    seed(users)
+    receipts = backend.Receipt.query
+    if role == "employee":
+        receipts = receipts.filter_by(user_id=users["employee"].id)
+    expected = legacy_statistics(receipts.all(), include_stores=role == "supervisor")
+
+    response = client.get('/statistics', headers=headers[role])
+    assert response.status_code == 200
+    assert_same(response.json, expected)
+
+
+def test_statistics_follow_writes(client, users, headers):
+    seed(users, count=50)
+    receipt = backend.Receipt.query.filter(backend.Receipt.status != "Rejected").first()
+    response = client.post(f'/update-receipt-status/{receipt.id}', headers=headers["supervisor"],
+                           json={"status": "Rejected", "comments": "no"})
+    assert response.status_code == 200
+    response = client.delete(f'/delete-receipt/{backend.Receipt.query.first().id}', headers=headers["admin"])
+    assert response.status_code == 200
+
+    assert_same(client.get('/statistics', headers=headers["supervisor"]).json,
+                legacy_statistics(backend.Receipt.query.all(), include_stores=True))
+
+
+def test_main_category_ties_break_alphabetically(client, users, headers):
+    # The legacy loop kept whichever tied category it met first, which depended on row order
+    add_receipt(users["employee"], store="Corner Shop", category="Travel", amount=5)
+    add_receipt(users["employee"], store="Corner Shop", category="Food", amount=5)
+
+    stats = client.get('/statistics', headers=headers["supervisor"]).json
+    assert stats["store_main_categories"]["Corner Shop"] == "Food"
@@ -54,6 +54,10 @@ const Main = () => {
             });
     
             if (response.ok) {
+                const result = await response.json();
+                if (result.possible_duplicates && result.possible_duplicates.length > 0) {
+                    toast.warn(`Submitted, but flagged as a possible duplicate of #${result.possible_duplicates[0].receipt_id}.`);
+                }
                 toast.success("Expense submitted successfully!");
                 setTimeout(() => {
                     window.location.reload();
@@ -119,9 +123,24 @@ const Main = () => {
                 body: formDataFile
             });
     
-            const data = await response.json();
+            let data = await response.json();
+            const imageHash = data.image_hash;
+            if (data.possible_duplicates && data.possible_duplicates.length > 0) {
+                toast.warn(`This receipt looks like one already submitted (#${data.possible_duplicates[0].receipt_id}).`);
+            }
+
+            // ⏳ OCR runs as a background job; long-poll until it finishes
+            while (response.ok && data.status === "queued") {
+                const jobResponse = await fetch(`http://127.0.0.1:5000/ocr-jobs/${data.job_id}?wait=25`, {
+                    headers: {
+                        "Authorization": `Bearer ${localStorage.getItem("token")}`
+                    }
+                });
+                data = await jobResponse.json();
+                if (!jobResponse.ok) break;
+            }
     
-            if (response.ok) {
+            if (response.ok && data.status === "done") {
                 toast.success("Receipt uploaded successfully!");
     
                 const extractedItems = data.items.length > 0 
@@ -135,7 +154,8 @@ const Main = () => {
                     ...prevData,
                     store: data.store_name || "",
                     category: matchCategoryCase(data.category) || "Groceries",
-                    items: extractedItems
+                    items: extractedItems,
+                    image_hash: imageHash  // lets the backend attach the OCR text for search
                 }));
 
                 console.log("Category from backend:", data.category);
@@ -152,6 +172,7 @@ const Main = () => {
 
             } else {
                 toast.error("Upload failed: " + (data.error || "Unknown error"));
+                setIsUploading(false);
             }
         } catch (error) {
             console.error("Upload error:", error);
@@ -523,7 +544,7 @@ const Main = () => {
 
                 <div className="upload-section">
                     <h2>Upload File</h2>
-                    <input type="file" className="input-field" onChange={(e) => uploadReceipt(e.target.files[0])} />
+                    <input type="file" accept="image/*,application/pdf" className="input-field" onChange={(e) => uploadReceipt(e.target.files[0])} />
                     {uploadedImageUrl && (
                         <div className="uploaded-image-preview">
                             <img src={uploadedImageUrl} alt="Uploaded receipt preview" />
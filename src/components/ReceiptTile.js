@@ -1,5 +1,6 @@
 import React, { useState } from "react";
 import "../styles/receiptTile.css"; // ✅ make sure you import your CSS
+import { loadReceiptDetails } from "../receiptDetailsLoader";
 
 const categoryColors = {
     groceries: "#d4edda",
@@ -16,20 +17,9 @@ const ReceiptTile = ({ receipt, isSupervisor, refreshReceipts }) => {
     const toggleExpand = async () => {
         if (!expanded) {
             try {
-                const res = await fetch(`http://127.0.0.1:5000/receipt-details/${receipt.id}`, {
-                    method: "GET",
-                    headers: {
-                        "Content-Type": "application/json",
-                        "Authorization": `Bearer ${localStorage.getItem("token")}`
-                    }
-                });
-                if (res.ok) {
-                    const data = await res.json();
-                    setItems(data.items);
-                    setUserName(data.user_name);
-                } else {
-                    console.error("Failed to fetch receipt details");
-                }
+                const data = await loadReceiptDetails(receipt.id);
+                setItems(data.items);
+                setUserName(data.user_name);
             } catch (error) {
                 console.error("Error fetching receipt details:", error);
             }
@@ -82,6 +72,9 @@ const ReceiptTile = ({ receipt, isSupervisor, refreshReceipts }) => {
             <div className="receipt-store">
                 <strong>{receipt.storeName}</strong>
             </div>
+            {isSupervisor && receipt.duplicateOf && (
+                <div className="receipt-duplicate">⚠ Possible duplicate of #{receipt.duplicateOf}</div>
+            )}
             <div className="receipt-amount">
                 <span>${receipt.amount}</span>
             </div>
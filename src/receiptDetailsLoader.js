@@ -0,0 +1,67 @@
+// Shared loader for receipt details: tiles that ask within the same tick are
+// coalesced into a single POST /receipt-details, and answers are cached by id.
+const API_URL = "http://127.0.0.1:5000/receipt-details";
+const MAX_BATCH_SIZE = 1000; // matches MAX_PAGE_SIZE on the backend
+
+const cache = new Map();   // id -> Promise of { items, user_name }
+let pending = new Map();   // id -> { resolve, reject } waiting for the next flush
+let scheduled = false;
+
+const flush = async () => {
+    const batch = pending;
+    pending = new Map();
+    scheduled = false;
+
+    const ids = [...batch.keys()];
+    for (let start = 0; start < ids.length; start += MAX_BATCH_SIZE) {
+        const chunk = ids.slice(start, start + MAX_BATCH_SIZE);
+        try {
+            const res = await fetch(API_URL, {
+                method: "POST",
+                headers: {
+                    "Content-Type": "application/json",
+                    "Authorization": `Bearer ${localStorage.getItem("token")}`
+                },
+                body: JSON.stringify({ ids: chunk })
+            });
+            if (!res.ok) {
+                throw new Error("Failed to fetch receipt details");
+            }
+            const data = await res.json();
+            chunk.forEach((id) => {
+                const details = data.details[String(id)];
+                if (details) {
+                    batch.get(id).resolve(details);
+                } else {
+                    batch.get(id).reject(new Error(`Receipt ${id} not found`));
+                }
+            });
+        } catch (error) {
+            chunk.forEach((id) => batch.get(id).reject(error));
+        }
+    }
+};
+
+export const loadReceiptDetails = (id) => {
+    if (!cache.has(id)) {
+        const promise = new Promise((resolve, reject) => {
+            pending.set(id, { resolve, reject });
+        });
+        // Failed lookups are not cached so the next expand retries
+        promise.catch(() => cache.delete(id));
+        cache.set(id, promise);
+        if (!scheduled) {
+            scheduled = true;
+            setTimeout(flush, 0);
+        }
+    }
+    return cache.get(id);
+};
+
+export const clearReceiptDetails = (id) => {
+    if (id === undefined) {
+        cache.clear();
+    } else {
+        cache.delete(id);
+    }
+};